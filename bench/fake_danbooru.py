@@ -0,0 +1,327 @@
+"""
+가짜 Danbooru 서버 (로컬 부하 테스트용)
+
+    python -m bench.fake_danbooru --artists 20 --posts 500 --size 200000 --port 8000
+
+지원:
+    /posts.json         tags (작가 / ~OR / id:>N / filetype: 무시), limit, page (숫자 / b<id> / a<id>)
+    /tags.json          search[name], search[name_comma]
+    /counts/posts.json  tags
+    /data/<id>.jpg      파일 본문 (Range 지원)
+    /_stats             요청 수 (JSON), /_reset 으로 초기화
+
+--latency / --file-latency 로 응답 지연, --throttle 로 초당 요청 상한 (넘으면 429),
+--errors 로 500 응답 비율을 준다.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+LIMIT_MAX = 200
+RANGE = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+# =========================
+# 가짜 데이터
+# =========================
+class FakeDanbooru:
+    """
+    artists: {작가 태그: 작품 수}
+    post id 는 작가 순서대로 1부터 연속 (작가마다 구간 1개)
+    """
+
+    def __init__(
+        self,
+        artists: dict,
+        file_size: int = 100_000,
+        latency: float = 0.0,
+        file_latency: float = 0.0,
+        throttle: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.file_size = file_size
+        self.latency = latency
+        self.file_latency = file_latency
+        self.throttle = throttle
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+        self.ids = {}     # artist → [id, ...] (최신 → 과거)
+        self.owner = {}   # id → artist
+        next_id = 1
+        for artist, count in artists.items():
+            ids = list(range(next_id, next_id + count))
+            for i in ids:
+                self.owner[i] = artist
+            self.ids[artist] = ids[::-1]
+            next_id += count
+
+        self._md5 = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._window = []  # throttle 용 최근 요청 시각
+
+        self.server = None
+
+    # -------------------------
+    # 파일 본문 / post
+    # -------------------------
+    def body(self, post_id: int) -> bytes:
+        head = f"{post_id:012d}".encode()
+        return (head * (self.file_size // len(head) + 1))[:self.file_size]
+
+    def md5(self, post_id: int) -> str:
+        m = self._md5.get(post_id)
+        if m is None:
+            m = self._md5[post_id] = hashlib.md5(self.body(post_id)).hexdigest()
+        return m
+
+    def post(self, post_id: int, host: str) -> dict:
+        url = f"{host}/data/{post_id}.jpg"
+        return {
+            "id": post_id,
+            "md5": self.md5(post_id),
+            "file_url": url,
+            "large_file_url": url,
+            "file_ext": "jpg",
+            "file_size": self.file_size,
+            "tag_string_artist": self.owner[post_id],
+        }
+
+    # -------------------------
+    # 검색
+    # -------------------------
+    def search(self, tags: str) -> list[int] | None:
+        """tags → id 목록 (최신 → 과거), 모르는 메타태그면 None"""
+        required = []
+        any_of = []
+        min_id = 0
+        for token in tags.split():
+            if token.startswith("~"):
+                any_of.append(token[1:])
+            elif token.startswith("id:>"):
+                min_id = int(token[4:])
+            elif token.startswith("filetype:"):
+                continue
+            elif ":" in token:
+                return None
+            else:
+                required.append(token)
+
+        if any_of:
+            ids = sorted({i for a in any_of for i in self.ids.get(a, [])}, reverse=True)
+        elif required:
+            ids = self.ids.get(required.pop(0), [])
+        else:
+            ids = sorted(self.owner, reverse=True)
+
+        # 나머지 태그는 AND (글마다 작가 1명이므로 사실상 같은 작가만 남음)
+        for artist in required:
+            ids = [i for i in ids if self.owner[i] == artist]
+
+        return [i for i in ids if i > min_id]
+
+    @staticmethod
+    def paginate(ids: list[int], page: str, limit: int) -> list[int]:
+        if page.startswith("b"):
+            before = int(page[1:])
+            return [i for i in ids if i < before][:limit]
+        if page.startswith("a"):
+            after = int(page[1:])
+            # id 바로 위쪽 limit 개, 응답 순서는 최신 → 과거
+            return sorted([i for i in ids if i > after])[:limit][::-1]
+        n = max(1, int(page or 1))
+        return ids[(n - 1) * limit:n * limit]
+
+    # -------------------------
+    # 통계 / 부하 조건
+    # -------------------------
+    def count(self, key: str):
+        with self._lock:
+            self._stats[key] = self._stats.get(key, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {}
+            self._window = []
+
+    def throttled(self) -> bool:
+        if self.throttle <= 0:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self.throttle:
+                return True
+            self._window.append(now)
+        return False
+
+    def failed(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    # -------------------------
+    # 서버
+    # -------------------------
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.fake = self
+        threading.Thread(target=self.server.serve_forever, daemon=True, name="fake-danbooru").start()
+        return f"http://{host}:{self.server.server_port}"
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code: int, data: bytes, ctype: str = "application/json", headers: dict | None = None):
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json(self, obj, code: int = 200):
+        self._send(code, json.dumps(obj).encode())
+
+    def do_GET(self):
+        fake = self.server.fake
+        u = urlparse(self.path)
+        q = {k: v[0] for k, v in parse_qs(u.query).items()}
+        host = f"http://{self.headers.get('Host') or '127.0.0.1'}"
+
+        if u.path == "/_stats":
+            return self._json(fake.stats())
+        if u.path == "/_reset":
+            fake.reset_stats()
+            return self._json({})
+
+        is_file = u.path.startswith("/data/")
+        fake.count("file" if is_file else "api")
+        fake.count(u.path if not is_file else "/data")
+
+        time.sleep(fake.file_latency if is_file else fake.latency)
+
+        if fake.throttled():
+            fake.count("429")
+            return self._send(429, b"{}", headers={"Retry-After": "1"})
+        if fake.failed():
+            fake.count("500")
+            return self._send(500, b"{}")
+
+        if u.path == "/posts.json":
+            ids = fake.search(q.get("tags", ""))
+            if ids is None:
+                return self._json({"success": False, "message": "unknown metatag"}, 422)
+            limit = min(int(q.get("limit", 20)), LIMIT_MAX)
+            page = fake.paginate(ids, q.get("page", "1"), limit)
+            return self._json([fake.post(i, host) for i in page])
+
+        if u.path == "/tags.json":
+            names = q.get("search[name_comma]", q.get("search[name]", "")).split(",")
+            return self._json([
+                {"name": n, "post_count": len(fake.ids[n])}
+                for n in names if n in fake.ids
+            ])
+
+        if u.path == "/counts/posts.json":
+            ids = fake.search(q.get("tags", "")) or []
+            return self._json({"counts": {"posts": len(ids)}})
+
+        if is_file:
+            try:
+                post_id = int(u.path.rsplit("/", 1)[-1].split(".")[0])
+            except ValueError:
+                return self._send(404, b"")
+            if post_id not in fake.owner:
+                return self._send(404, b"")
+
+            data = fake.body(post_id)
+            m = RANGE.match(self.headers.get("Range", ""))
+            if m:
+                start = int(m.group(1))
+                end = int(m.group(2)) if m.group(2) else len(data) - 1
+                if start >= len(data):
+                    return self._send(416, b"", headers={"Content-Range": f"bytes */{len(data)}"})
+                end = min(end, len(data) - 1)
+                return self._send(
+                    206,
+                    data[start:end + 1],
+                    "image/jpeg",
+                    {"Content-Range": f"bytes {start}-{end}/{len(data)}", "Accept-Ranges": "bytes"},
+                )
+            return self._send(200, data, "image/jpeg", {"Accept-Ranges": "bytes"})
+
+        self._send(404, b"")
+
+
+def make_artists(n: int, posts: int, spread: bool = True) -> dict:
+    """
+    작가 n 명, 작품 수는 spread 면 posts 를 기준으로 작가마다 다르게
+    (1/8 배 ~ 2배, 작은 작가 묶음 조회 / 정렬 정책도 같이 측정되도록)
+    """
+    if not spread:
+        return {f"artist_{i:03d}": posts for i in range(n)}
+    scale = (0.125, 0.25, 0.5, 1.0, 2.0)
+    return {f"artist_{i:03d}": max(1, int(posts * scale[i % len(scale)])) for i in range(n)}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m bench.fake_danbooru", description="가짜 Danbooru 서버")
+    p.add_argument("--artists", type=int, default=10, help="작가 수")
+    p.add_argument("--posts", type=int, default=500, help="작가당 기준 작품 수")
+    p.add_argument("--same-size", action="store_true", help="모든 작가 작품 수를 같게")
+    p.add_argument("--size", type=int, default=100_000, help="파일 크기 (바이트)")
+    p.add_argument("--latency", type=float, default=0.0, help="API 응답 지연 (초)")
+    p.add_argument("--file-latency", type=float, default=0.0, help="파일 응답 지연 (초)")
+    p.add_argument("--throttle", type=float, default=0.0, help="초당 요청 상한 (0 = 없음, 넘으면 429)")
+    p.add_argument("--errors", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    args = p.parse_args(argv)
+
+    fake = FakeDanbooru(
+        make_artists(args.artists, args.posts, spread=not args.same_size),
+        file_size=args.size,
+        latency=args.latency,
+        file_latency=args.file_latency,
+        throttle=args.throttle,
+        error_rate=args.errors,
+    )
+    url = fake.start(args.host, args.port)
+    print(url, flush=True)
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+오프라인 처리량 벤치마크 (가짜 Danbooru 서버 대상)
+
+    python -m bench.run
+    python -m bench.run --artists 20 --posts 400 --size 200000 --latency 0.02 --memory
+    python -m bench.run --save base.json
+    python -m bench.run --baseline base.json      # 느려졌으면 종료 코드 1
+
+시나리오:
+    count_by_pages  get_total_count_by_pages (가장 큰 작가)
+    artist_cold     download_artist 1명, 빈 폴더
+    artist_warm     download_artist 같은 작가 다시 (전부 보유)
+    engine          DownloadEngine 전체 목록, 빈 폴더
+    engine_resync   같은 목록 다시 (완료 기록만 지우고, watermark 증분 조회)
+
+가짜 서버는 별도 프로세스로 띄운다 (서버 CPU/메모리가 측정에 섞이지 않게).
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+
+import config
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# =========================
+# 가짜 서버 (하위 프로세스)
+# =========================
+def start_server(args) -> tuple[subprocess.Popen, str]:
+    cmd = [
+        sys.executable, "-m", "bench.fake_danbooru",
+        "--artists", str(args.artists),
+        "--posts", str(args.posts),
+        "--size", str(args.size),
+        "--latency", str(args.latency),
+        "--file-latency", str(args.file_latency),
+        "--throttle", str(args.throttle),
+        "--errors", str(args.errors),
+        "--port", "0",
+    ]
+    if args.same_size:
+        cmd.append("--same-size")
+
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    url = proc.stdout.readline().strip()
+    if not url.startswith("http"):
+        proc.kill()
+        raise RuntimeError("fake server did not start")
+    return proc, url
+
+
+def server_call(url: str, path: str) -> dict:
+    with urllib.request.urlopen(url + path, timeout=10) as r:
+        return json.loads(r.read())
+
+
+def point_at(url: str, args):
+    """
+    config 의 URL / 속도 값을 가짜 서버로 (core import 전에 호출)
+    이미 import 된 모듈이 있으면 그 모듈의 상수도 같이 바꾼다
+    """
+    values = {
+        "BASE_URL": url + "/posts.json",
+        "TAG_URL": url + "/tags.json",
+        "COUNTS_URL": url + "/counts/posts.json",
+        "API_RATE": args.api_rate,
+        "API_BURST": max(config.API_BURST, int(args.api_rate)),
+        "FILE_RATE": args.file_rate,
+        "FILE_BURST": max(config.FILE_BURST, int(args.file_rate)),
+    }
+    for name, value in values.items():
+        setattr(config, name, value)
+        for mod in ("core.downloader", "core.post_count", "core.artist_resolver", "core.rate_limiter"):
+            m = sys.modules.get(mod)
+            if m is not None and hasattr(m, name):
+                setattr(m, name, value)
+
+
+# =========================
+# 측정
+# =========================
+def peak_rss_mb() -> float | None:
+    """프로세스 최대 RSS (시작 이후 누적 최대값)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 바이트
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def measure(name: str, url: str, fn, n_artists: int, trace: bool) -> dict:
+    server_call(url, "/_reset")
+    if trace:
+        tracemalloc.start()
+
+    started = time.perf_counter()
+    files = fn()
+    elapsed = time.perf_counter() - started
+
+    py_peak = None
+    if trace:
+        py_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+    stats = server_call(url, "/_stats")
+    api = stats.get("api", 0)
+    return {
+        "scenario": name,
+        "seconds": round(elapsed, 3),
+        "files": files,
+        "files_per_s": round(files / elapsed, 2) if elapsed > 0 else 0.0,
+        "api_calls": api,
+        "api_per_artist": round(api / max(1, n_artists), 2),
+        "file_requests": stats.get("file", 0),
+        "http_429": stats.get("429", 0),
+        "http_500": stats.get("500", 0),
+        "py_peak_mb": round(py_peak, 1) if py_peak is not None else None,
+        "rss_peak_mb": round(peak_rss_mb(), 1) if resource is not None else None,
+    }
+
+
+def run_scenarios(url: str, args, workdir: str) -> list[dict]:
+    # config 를 바꾼 뒤에 core import
+    from bench.fake_danbooru import make_artists
+    from core.downloader import download_artist, get_total_count_by_pages
+    from core.download_index import DownloadIndex
+    from core.engine import DownloadEngine, EVENT_ARTIST_DONE
+    from utils.logger import flush_logs
+
+    artists = make_artists(args.artists, args.posts, spread=not args.same_size)
+    biggest = max(artists, key=artists.get)
+    log_path = os.path.join(workdir, "bench_log.txt")
+    results = []
+
+    # -------------------------
+    # 페이지 탐색으로 작품 수 세기
+    # -------------------------
+    def count_by_pages():
+        total = get_total_count_by_pages(biggest, log_path)
+        if total != artists[biggest]:
+            print(f"! count_by_pages: {total} != {artists[biggest]}", file=sys.stderr)
+        return 0
+
+    results.append(measure("count_by_pages", url, count_by_pages, 1, args.memory))
+
+    # -------------------------
+    # 작가 1명 (빈 폴더 → 전부 보유)
+    # -------------------------
+    single_dir = os.path.join(workdir, "single")
+    index = DownloadIndex(os.path.join(workdir, "single_index.sqlite3"))
+
+    def artist_run(initial_exist: int):
+        def run():
+            _, downloaded = download_artist(
+                artist=biggest,
+                base_dir=single_dir,
+                log_path=log_path,
+                total_count=artists[biggest],
+                initial_exist_count=initial_exist,
+                index=index,
+                # 다시 받을 때 watermark 가 아니라 기존 파일 판단 경로를 재도록
+                sync_state=None,
+            )
+            return downloaded
+        return run
+
+    results.append(measure("artist_cold", url, artist_run(0), 1, args.memory))
+    results.append(measure("artist_warm", url, artist_run(artists[biggest]), 1, args.memory))
+    index.close()
+
+    # -------------------------
+    # 전체 목록 (엔진)
+    # -------------------------
+    engine_dir = os.path.join(workdir, "engine")
+    list_path = os.path.join(workdir, "artists.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write(engine_dir + "\n")
+        for artist in artists:
+            f.write(artist + "\n")
+
+    def engine_run():
+        files = {"n": 0}
+
+        def on_event(kind, data):
+            if kind == EVENT_ARTIST_DONE:
+                files["n"] += data["downloaded"]
+
+        DownloadEngine(list_path, slots=args.slots, on_event=on_event).run()
+        return files["n"]
+
+    results.append(measure("engine", url, engine_run, len(artists), args.memory))
+
+    os.remove(os.path.splitext(list_path)[0] + "_completed.txt")
+    results.append(measure("engine_resync", url, engine_run, len(artists), args.memory))
+
+    flush_logs()
+    return results
+
+
+# =========================
+# 출력 / 기준값 비교
+# =========================
+COLUMNS = (
+    ("scenario", 15), ("seconds", 9), ("files", 7), ("files_per_s", 12),
+    ("api_calls", 10), ("api_per_artist", 15), ("file_requests", 14),
+    ("http_429", 9), ("py_peak_mb", 11), ("rss_peak_mb", 12),
+)
+
+
+def print_table(results: list[dict]):
+    print("".join(name.ljust(width) for name, width in COLUMNS))
+    for r in results:
+        print("".join(
+            ("-" if r.get(name) is None else str(r.get(name))).ljust(width)
+            for name, width in COLUMNS
+        ))
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """기준 대비 files/s 가 tolerance 이상 떨어졌거나 API 호출이 늘어난 시나리오"""
+    base = {r["scenario"]: r for r in baseline}
+    problems = []
+    for r in results:
+        b = base.get(r["scenario"])
+        if b is None:
+            continue
+        if b["files_per_s"] and r["files_per_s"] < b["files_per_s"] * (1 - tolerance):
+            problems.append(f"{r['scenario']}: files/s {r['files_per_s']} < baseline {b['files_per_s']}")
+        if r["api_calls"] > b["api_calls"]:
+            problems.append(f"{r['scenario']}: api calls {r['api_calls']} > baseline {b['api_calls']}")
+    return problems
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.run", description="가짜 서버 대상 처리량 벤치마크")
+    p.add_argument("--artists", type=int, default=10, help="작가 수")
+    p.add_argument("--posts", type=int, default=400, help="작가당 기준 작품 수 (작가마다 1/8~2배)")
+    p.add_argument("--same-size", action="store_true", help="모든 작가 작품 수를 같게")
+    p.add_argument("--size", type=int, default=50_000, help="파일 크기 (바이트)")
+    p.add_argument("--latency", type=float, default=0.01, help="API 응답 지연 (초)")
+    p.add_argument("--file-latency", type=float, default=0.005, help="파일 응답 지연 (초)")
+    p.add_argument("--throttle", type=float, default=0.0, help="서버 초당 요청 상한 (0 = 없음)")
+    p.add_argument("--errors", type=float, default=0.0, help="서버 500 응답 비율 (0~1)")
+    p.add_argument("--api-rate", type=float, default=1000.0, help="클라이언트 API 요청/초")
+    p.add_argument("--file-rate", type=float, default=1000.0, help="클라이언트 파일 요청/초")
+    p.add_argument("--slots", type=int, default=config.ARTIST_WORKERS, help="엔진 동시 작가 수")
+    p.add_argument("--memory", action="store_true", help="tracemalloc 으로 시나리오별 Python 메모리 최대값 (느려짐)")
+    p.add_argument("--keep", action="store_true", help="받은 파일 / 로그를 지우지 않음")
+    p.add_argument("--save", help="결과 JSON 저장 경로")
+    p.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    p.add_argument("--tolerance", type=float, default=0.2, help="files/s 허용 하락 비율")
+    args = p.parse_args(argv)
+
+    proc, url = start_server(args)
+    workdir = tempfile.mkdtemp(prefix="dl_bench_")
+    try:
+        point_at(url, args)
+        results = run_scenarios(url, args, workdir)
+    finally:
+        proc.terminate()
+        proc.wait()
+        if args.keep:
+            print(f"work dir: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_table(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+
+        # 부하 조건이 다르면 비교 의미 없음 → 알림만
+        workload = ("artists", "posts", "same_size", "size", "latency", "file_latency", "throttle", "errors", "slots")
+        changed = [k for k in workload if saved.get("args", {}).get(k) != getattr(args, k)]
+        if changed:
+            print("note: baseline workload differs (" + ", ".join(changed) + ")")
+
+        problems = compare(results, saved["results"], args.tolerance)
+        for line in problems:
+            print("REGRESSION " + line)
+        return 1 if problems else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+GUI 없이 실행 (서버 / cron 용)
+
+    python -m cli artists.txt
+    python -m cli artists.txt --overwrite --artists 3 --files 8 --api-rate 1.5
+    python -m cli artists.txt --verify
+
+tkinter 는 import 하지 않는다.
+"""
+import argparse
+import sys
+import threading
+import time
+
+import config
+from core.scheduling import SCHEDULE_POLICIES
+
+
+def _parse_args(argv=None):
+    p = argparse.ArgumentParser(prog="python -m cli", description="Danbooru 작가 목록 다운로드 (GUI 없음)")
+    p.add_argument("list_path", help="작가 목록 TXT (1번째 줄 저장 경로, 이후 1줄 1작가)")
+    p.add_argument("--overwrite", action="store_true", help="기존 파일도 다시 받기 (기본: 스킵)")
+    p.add_argument("--variant", default=config.DOWNLOAD_VARIANT, help="original / large / sample / best_under")
+    p.add_argument("--order", default=config.SCHEDULE_POLICY, choices=SCHEDULE_POLICIES, help="작가 처리 순서")
+    p.add_argument("--artists", type=int, default=config.ARTIST_WORKERS, help="동시에 진행할 작가 수")
+    p.add_argument("--files", type=int, default=config.FILE_WORKERS, help="작가 1명당 동시 파일 다운로드 수")
+    p.add_argument("--api-rate", type=float, default=config.API_RATE, help="API 요청/초")
+    p.add_argument("--file-rate", type=float, default=config.FILE_RATE, help="파일 요청/초")
+    p.add_argument("--verify", action="store_true", help="다운로드 대신 저장된 파일 md5 검증")
+    p.add_argument("--rebuild-index", action="store_true", help="다운로드 대신 인덱스 재구성")
+    return p.parse_args(argv)
+
+
+def _apply_overrides(args):
+    # core 모듈은 import 시점에 config 값을 읽으므로 import 전에 반영
+    config.FILE_WORKERS = max(1, args.files)
+    config.ARTIST_WORKERS = max(1, args.artists)
+    config.API_RATE = args.api_rate
+    config.FILE_RATE = args.file_rate
+
+
+class _Printer:
+    """진행 출력: 작가가 끝날 때마다 1줄, 터미널이면 상태 줄을 0.5초마다 덮어쓰기"""
+
+    def __init__(self, out=sys.stdout):
+        self.out = out
+        self.tty = out.isatty()
+        self.lock = threading.Lock()
+        self.last_status = 0.0
+        self.status = ""
+
+    def line(self, text: str):
+        with self.lock:
+            if self.tty and self.status:
+                self.out.write("\r" + " " * len(self.status) + "\r")
+            self.out.write(text + "\n")
+            if self.tty and self.status:
+                self.out.write(self.status)
+            self.out.flush()
+
+    def set_status(self, text: str, force: bool = False):
+        if not self.tty:
+            return
+        now = time.monotonic()
+        with self.lock:
+            if not force and now - self.last_status < 0.5:
+                return
+            self.last_status = now
+            pad = max(0, len(self.status) - len(text))
+            self.status = text
+            self.out.write("\r" + text + " " * pad)
+            self.out.flush()
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    _apply_overrides(args)
+
+    from core.artist_list import parse_artist_file
+    from core.downloader import VARIANTS
+    from core.engine import (
+        DownloadEngine,
+        rebuild_index,
+        verify_all,
+        EVENT_COUNTING,
+        EVENT_TOTAL,
+        EVENT_ARTIST_DONE,
+        EVENT_FINISHED,
+    )
+
+    if args.variant not in VARIANTS:
+        print(f"알 수 없는 variant: {args.variant} ({', '.join(VARIANTS)})", file=sys.stderr)
+        return 2
+
+    pairs = parse_artist_file(args.list_path)
+    if not pairs:
+        print(f"작가 목록이 비어 있거나 파일이 없습니다: {args.list_path}", file=sys.stderr)
+        return 2
+
+    if args.rebuild_index:
+        print(f"인덱스 재구성 완료: {rebuild_index(args.list_path, pairs)}개 파일")
+        return 0
+
+    printer = _Printer()
+
+    if args.verify:
+        def on_verify(checked, total, bad):
+            printer.set_status(f"검증 중 {checked} / {total} (손상 {bad})", force=(checked == total))
+
+        checked, bad = verify_all(args.list_path, pairs, on_progress=on_verify)
+        printer.line(f"검증 완료: {checked}개 중 손상 {bad}개")
+        return 1 if bad else 0
+
+    state = {"done": 0, "posts_done": 0, "posts_total": 0, "report": []}
+
+    def on_event(kind, data):
+        if kind == EVENT_COUNTING:
+            printer.line("작품 수 조회 중...")
+
+        elif kind == EVENT_TOTAL:
+            state.update(done=data["done"], posts_done=data["posts_done"], posts_total=data["posts_total"])
+            status = f"작가 {data['done']} / {data['artists']}"
+            if data["posts_total"] > 0:
+                owned = min(data["posts_done"], data["posts_total"])
+                status += f" · 작품 {owned} / {data['posts_total']} ({owned / data['posts_total'] * 100:.1f}%)"
+            printer.set_status(status)
+
+        elif kind == EVENT_ARTIST_DONE:
+            mark = "OK " if data["ok"] else "-- "
+            printer.line(f"{mark}[{data['done']}/{len(pairs)}] {data['artist']} : +{data['downloaded']}")
+
+        elif kind == EVENT_FINISHED:
+            state["report"] = data["report"]
+
+    engine = DownloadEngine(
+        args.list_path,
+        pairs=pairs,
+        overwrite=args.overwrite,
+        variant=args.variant,
+        policy=args.order,
+        slots=args.artists,
+        on_event=on_event,
+    )
+
+    started = time.monotonic()
+    t = engine.start()
+
+    # Ctrl+C 1번: 진행 중인 이미지/페이지까지 마무리하고 종료, 2번: 즉시 종료
+    interrupted = False
+    while t.is_alive():
+        try:
+            t.join(0.5)
+        except KeyboardInterrupt:
+            if interrupted:
+                return 130
+            interrupted = True
+            engine.stop_event.set()
+            printer.line("중지 요청: 진행 중인 파일을 마무리하는 중... (한 번 더 누르면 즉시 종료)")
+
+    printer.set_status("", force=True)
+    printer.line(
+        f"완료: 작가 {state['done']} / {len(pairs)} · {time.monotonic() - started:.1f}s"
+        f" · 로그 {engine.log_path}"
+    )
+    for line in state["report"]:
+        printer.line("  " + line)
+    return 130 if interrupted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,118 @@
 BASE_URL = "https://danbooru.donmai.us/posts.json"
 TAG_URL = "https://danbooru.donmai.us/tags.json"
+COUNTS_URL = "https://danbooru.donmai.us/counts/posts.json"
 
 HEADERS = {
     "User-Agent": "DanbooruArtistDownloader/2.0 (personal use)"
 }
 
-LIMIT = 100
-SLEEP_PAGE = 1.0
-SLEEP_FILE = 0.3
+LIMIT = 200  # posts.json 최대값
+
+# posts 조회 시 확장자 필터를 검색식(filetype:)으로 서버에 넘김
+# (태그 수 제한에 걸리면 자동으로 빼고 클라이언트 필터만 사용)
+SERVER_FILETYPE_FILTER = True
+
+# 받을 파일 종류 (실행 단위 기본값, UI 에서 변경 가능)
+# - "original":   원본 (file_url)
+# - "large":      large_file_url (긴 변 850px 샘플, 작은 원본은 원본 그대로)
+# - "sample":     media_asset 의 sample variant (없으면 large)
+# - "best_under": 원본이 VARIANT_MAX_MB 이하면 원본, 넘으면 large
+# original 이외는 작가 폴더 안 _<종류> 폴더에 따로 저장 (존재 판단도 따로)
+DOWNLOAD_VARIANT = "original"
+VARIANT_MAX_MB = 10
+
+# posts 페이지 넘김 방식
+# - "cursor":  page=b<마지막 id> (깊이와 상관없이 일정한 속도, 페이지 수 상한 없음)
+# - "numeric": page=1,2,3... (cursor 가 안 될 때의 예비용)
+PAGE_MODE = "cursor"
+
+# 파일을 받는 동안 미리 받아 둘 posts 페이지 수
+PAGE_PREFETCH = 2
+
+# 요청 속도 제한 (token bucket, 초당 요청 수 상한)
+# - API: posts.json / tags.json
+# - FILE: CDN 원본 파일
+# 429/5xx 를 받으면 RATE_BACKOFF 배로 줄이고 (Retry-After 준수),
+# 성공할 때마다 상한의 RATE_RECOVER 만큼 천천히 회복
+API_RATE = 2.0
+API_BURST = 2
+FILE_RATE = 8.0
+FILE_BURST = 4
+RATE_BACKOFF = 0.5
+RATE_RECOVER = 0.02
+RATE_MIN_FACTOR = 0.1
+
+# 429/5xx 재시도 횟수
+HTTP_MAX_RETRIES = 3
 
 LOGIN = None
 API_KEY = None
+
+# 작가 1명 안에서 동시에 받는 파일 수 (1 = 기존처럼 순차)
+FILE_WORKERS = 4
+
+# 동시에 진행하는 작가 수 (UI 슬롯 수와 같음)
+ARTIST_WORKERS = 2
+
+# HTTP 연결 풀 (keep-alive)
+# - HTTP_POOL_CONNECTIONS: 풀을 유지할 호스트 수 (API / CDN ...)
+# - HTTP_POOL_MAXSIZE: 호스트당 동시에 유지하는 연결 수 (최소값)
+#   실제 크기는 ARTIST_WORKERS × FILE_WORKERS × SEGMENT_COUNT 이상으로 맞춘다
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 16
+
+# 작가별 전체 작품 수 캐시 유지 시간 (초)
+COUNT_CACHE_TTL = 24 * 60 * 60
+
+# 시작 전 작품 수 일괄 조회 (tags.json 1회에 여러 작가)
+COUNT_PREFETCH_BATCH = 100
+COUNT_PREFETCH_WORKERS = 4
+
+# 다운로드 인덱스 (SQLite, <목록>_index.sqlite3)
+# 기존 파일 판단을 파일 시스템 대신 인덱스로
+USE_DOWNLOAD_INDEX = True
+
+# 다른 작가 폴더에 같은 md5 파일이 있으면 다시 받지 않고 링크 (인덱스 필요)
+DEDUP_BY_MD5 = True
+
+# 파일 전송이 끊겼을 때 .part 에서 이어받는 재시도 횟수
+FILE_RESUME_RETRIES = 2
+
+# 받은 파일을 post 의 file_size / md5 로 검증 (받는 동안 해시 계산)
+# 맞지 않는 파일은 <저장 경로>/_quarantine 으로 옮기고 다시 받음
+VERIFY_MD5 = True
+QUARANTINE_DIR = "_quarantine"
+
+# 큰 파일(동영상 등)은 여러 Range 구간으로 나눠 동시에 받기
+SEGMENT_THRESHOLD_MB = 32
+SEGMENT_COUNT = 4
+
+# 작품 수가 적은 작가들을 "~작가1 ~작가2 ..." 검색 1번으로 묶어서 조회
+# BATCH_SIZE 는 검색 태그 수 제한 안에서 (비로그인 2, Gold 이상은 더 크게)
+BATCH_SMALL_ARTISTS = True
+BATCH_SMALL_MAX_POSTS = 50
+BATCH_SIZE = 2
+
+# 작가 처리 순서 (예상 남은 작업 = 전체 작품 수 - 이미 가진 수)
+# - "file_order":     목록 파일 순서
+# - "smallest_first": 남은 작업이 적은 작가부터 (중단돼도 많은 작가를 끝냄)
+# - "largest_first":  남은 작업이 많은 작가부터 (동시 진행 시 부하 분산)
+SCHEDULE_POLICY = "file_order"
+
+# 화면 갱신 주기 (ms) — 진행 값은 최신 값만 보관하고 이 주기로 한 번에 반영
+UI_POLL_MS = 100
+
+# 로그 (<목록>_log.txt)
+# - 기록은 큐에 넣고 전용 스레드 1개가 모아서 씀 (다운로드 워커는 디스크 I/O 대기 없음)
+# - LOG_MAX_MB 를 넘으면 _log.txt.1, .2 ... 로 밀어내고 새 파일 (LOG_BACKUPS 개 유지)
+# - LOG_FORMAT = "jsonl" 이면 같은 위치에 _log.jsonl 로 1줄 1 JSON 기록
+LOG_MAX_MB = 10
+LOG_BACKUPS = 3
+LOG_FORMAT = "text"
+LOG_FLUSH_INTERVAL = 0.5
+
+# 실행 지표 스냅샷 파일 (<목록>_metrics.prom / _metrics.json)
+# - None 이면 안 씀, 실행 중 METRICS_EXPORT_INTERVAL 초마다 갱신
+# - 작가별 요약 1줄 / 실행 종료 요약은 항상 로그에 기록
+METRICS_EXPORT = None  # "prom" / "json"
+METRICS_EXPORT_INTERVAL = 10
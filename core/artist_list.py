@@ -56,3 +56,29 @@ def read_completed(path: str) -> set[str]:
 def append_completed(path: str, artist: str):
     with open(path, "a", encoding="utf-8") as f:
         f.write(artist + "\n")
+
+
+def remove_completed(path: str, artists):
+    """완료 목록에서 제외 (다음 실행에서 다시 처리)"""
+    artists = set(artists)
+    if not artists or not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [l.strip() for l in f if l.strip()]
+    with open(path, "w", encoding="utf-8") as f:
+        for artist in lines:
+            if artist not in artists:
+                f.write(artist + "\n")
+
+
+def list_file_paths(path: str) -> dict:
+    """작가 목록 TXT 옆에 두는 기록 파일 경로 (<목록>_completed.txt 등)"""
+    base, _ = os.path.splitext(path)
+    return {
+        "completed": base + "_completed.txt",
+        "log": base + "_log.txt",
+        "counts": base + "_counts.json",
+        "sync": base + "_sync.json",
+        "index": base + "_index.sqlite3",
+        "metrics": base + "_metrics",  # + .prom / .json (METRICS_EXPORT)
+    }
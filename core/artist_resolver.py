@@ -1,16 +1,15 @@
-import requests
-from config import TAG_URL, HEADERS
+from config import TAG_URL
+from core.http_client import api_get
 
 def resolve_artist(name: str) -> str | None:
     try:
-        r = requests.get(
+        r = api_get(
             TAG_URL,
             params={
                 "search[name_matches]": f"*{name}*",
                 "search[category]": 1,
                 "limit": 5
             },
-            headers=HEADERS,
             timeout=10
         )
         if r.status_code != 200:
@@ -0,0 +1,40 @@
+import os
+import threading
+
+# 받는 중인 임시 파일 (완료되면 최종 이름으로 교체됨)
+PART_SUFFIX = ".part"
+
+
+# =========================
+# 저장 폴더 스냅샷 (scandir 1회)
+# =========================
+class DirSnapshot:
+    """
+    폴더의 파일명을 한 번만 읽어 set 으로 들고 있는다.
+
+    - 기존 파일 수(len) 와 파일별 존재 확인(in) 을 같은 목록으로
+    - 새로 받은 파일은 add() 로 반영 (다운로드 워커에서 호출)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._names = set()
+        self._lock = threading.Lock()
+
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.endswith(PART_SUFFIX):
+                        self._names.add(entry.name)
+        except OSError:
+            pass
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str):
+        with self._lock:
+            self._names.add(name)
@@ -0,0 +1,188 @@
+import os
+import sqlite3
+import threading
+import time
+
+from config import QUARANTINE_DIR
+from core.dir_snapshot import PART_SUFFIX
+from core.verify import MD5_NAME
+
+
+# =========================
+# 다운로드 인덱스 (SQLite)
+# =========================
+class DownloadIndex:
+    """
+    다운로드가 끝난 파일 1개 = 1행
+
+    - dir / name : 저장 폴더 / 파일명 (기존 파일 판단 키)
+    - post_id / md5 / artist / size / ts
+
+    연결 1개를 여러 워커가 같이 쓰므로 모든 접근은 lock 안에서.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS downloads (
+                    dir     TEXT NOT NULL,
+                    name    TEXT NOT NULL,
+                    artist  TEXT,
+                    post_id INTEGER,
+                    md5     TEXT,
+                    size    INTEGER,
+                    ts      REAL,
+                    PRIMARY KEY (dir, name)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_downloads_md5 ON downloads (md5)")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # -------------------------
+    # 조회
+    # -------------------------
+    def names(self, save_dir: str) -> set[str]:
+        """폴더 1개의 파일명 전체 (작가 시작 시 1번 → 이후 메모리 set 조회)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM downloads WHERE dir = ?",
+                (os.path.normpath(save_dir),),
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def count(self, save_dir: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM downloads WHERE dir = ?",
+                (os.path.normpath(save_dir),),
+            ).fetchone()
+        return row[0]
+
+    def counts_by_dir(self) -> dict[str, int]:
+        """폴더별 파일 수 전체 (쿼리 1번)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dir, COUNT(*) FROM downloads GROUP BY dir"
+            ).fetchall()
+        return {d: n for d, n in rows}
+
+    def find_by_md5(self, md5: str) -> list[str]:
+        """같은 md5 로 기록된 파일 경로들 (폴더 무관)"""
+        if not md5:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dir, name FROM downloads WHERE md5 = ?",
+                (md5,),
+            ).fetchall()
+        return [os.path.join(d, n) for d, n in rows]
+
+    # -------------------------
+    # 기록
+    # -------------------------
+    def add(
+        self,
+        save_dir: str,
+        name: str,
+        artist: str = "",
+        post_id: int | None = None,
+        md5: str | None = None,
+        size: int | None = None,
+    ):
+        self.add_many([(save_dir, name, artist, post_id, md5, size)])
+
+    def add_many(self, rows):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO downloads (dir, name, artist, post_id, md5, size, ts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (os.path.normpath(d), n, a, pid, m, sz, now)
+                    for d, n, a, pid, m, sz in rows
+                ],
+            )
+            self._conn.commit()
+
+    def remove(self, path: str):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM downloads WHERE dir = ? AND name = ?",
+                (os.path.normpath(os.path.dirname(path)), os.path.basename(path)),
+            )
+            self._conn.commit()
+
+    # -------------------------
+    # 디스크에서 재구성 (1회성)
+    # -------------------------
+    def rebuild_from_disk(self, base_dir: str, stop_event=None) -> int:
+        """
+        base_dir 아래 작가 폴더들 (+ 그 안의 _<variant> 폴더) 을 훑어서 인덱스를 새로 채운다.
+        post_id 는 알 수 없으므로 비워 두고, 파일명이 md5 형식이면 md5 로 기록.
+        반환: 기록한 파일 수
+        """
+        base_dir = os.path.normpath(base_dir)
+
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM downloads WHERE dir LIKE ? ESCAPE '\\'",
+                (_like_prefix(base_dir),),
+            )
+            self._conn.commit()
+
+        total = 0
+        try:
+            artist_dirs = [e for e in os.scandir(base_dir) if e.is_dir() and not e.name.startswith("_")]
+        except OSError:
+            return 0
+
+        for entry in artist_dirs:
+            if stop_event and stop_event.is_set():
+                break
+
+            rows = _scan_files(entry.path, entry.name)
+            try:
+                # variant 폴더 (_large 등) 도 같은 작가로, 격리 폴더는 제외
+                for sub in os.scandir(entry.path):
+                    if sub.is_dir() and sub.name.startswith("_") and sub.name != QUARANTINE_DIR:
+                        rows.extend(_scan_files(sub.path, entry.name))
+            except OSError:
+                continue
+
+            if rows:
+                self.add_many(rows)
+                total += len(rows)
+
+        return total
+
+
+def _file_row(folder: str, artist: str, f: os.DirEntry) -> tuple | None:
+    """rebuild_from_disk 용 1행 (.part / 폴더면 None)"""
+    if not f.is_file() or f.name.endswith(PART_SUFFIX):
+        return None
+    stem = os.path.splitext(f.name)[0].lower()
+    return (folder, f.name, artist, None, stem if MD5_NAME.match(stem) else None, f.stat().st_size)
+
+
+def _scan_files(folder: str, artist: str) -> list[tuple]:
+    try:
+        return [row for row in (_file_row(folder, artist, f) for f in os.scandir(folder)) if row]
+    except OSError:
+        return []
+
+
+def _like_prefix(path: str) -> str:
+    escaped = path.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + os.sep.replace("\\", "\\\\") + "%"
@@ -1,7 +1,10 @@
+import hashlib
 import os
-import time
-import requests
+import queue
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Tuple
 
 WINDOWS_RESERVED_NAMES = {
@@ -40,13 +43,23 @@ def sanitize_folder_name(name: str) -> str:
 
 from config import (
     BASE_URL,
-    HEADERS,
     LIMIT,
-    SLEEP_FILE,
-    SLEEP_PAGE,
-    LOGIN,
-    API_KEY,
+    PAGE_MODE,
+    PAGE_PREFETCH,
+    SERVER_FILETYPE_FILTER,
+    VARIANT_MAX_MB,
+    FILE_WORKERS,
+    DEDUP_BY_MD5,
+    FILE_RESUME_RETRIES,
+    VERIFY_MD5,
+    SEGMENT_THRESHOLD_MB,
+    SEGMENT_COUNT,
 )
+from core.dir_snapshot import DirSnapshot, PART_SUFFIX
+from core.file_link import link_existing
+from core.http_client import api_get, file_get
+from core.metrics import get_metrics
+from core.verify import hash_file, quarantine
 from utils.logger import log_write
 
 
@@ -59,6 +72,57 @@ ALLOWED_EXT = {
     ".webm", ".mp4"
 }
 
+# 서버 쪽 필터 (Danbooru 는 jpeg 를 jpg 로 저장)
+FILETYPE_TAG = "filetype:" + ",".join(sorted(e.lstrip(".") for e in ALLOWED_EXT if e != ".jpeg"))
+
+# posts 조회 시 받을 필드 (나머지 태그 문자열/variants 등은 받지 않음)
+POST_FIELDS = "id,md5,file_url,file_ext,file_size"
+
+# =========================
+# 받을 파일 종류 (variant)
+# =========================
+VARIANTS = ("original", "large", "sample", "best_under")
+
+# variant 별 추가로 필요한 필드
+VARIANT_FIELDS = {
+    "original": "",
+    "large": ",large_file_url",
+    "sample": ",large_file_url,media_asset[variants]",
+    "best_under": ",large_file_url",
+}
+
+
+def artist_save_dir(base_dir: str, artist: str, variant: str = "original") -> str:
+    """작가 저장 폴더 (original 이외는 그 안의 _<variant> 폴더)"""
+    save_dir = os.path.join(base_dir, sanitize_folder_name(artist))
+    if variant != "original":
+        save_dir = os.path.join(save_dir, f"_{variant}")
+    return save_dir
+
+
+def pick_variant_url(post: dict, variant: str) -> str | None:
+    """
+    post 에서 variant 에 맞는 파일 URL 선택
+    (원본이 아니면 md5/file_size 가 맞지 않으므로 검증/중복 링크 대상 아님)
+    """
+    original = post.get("file_url")
+    large = post.get("large_file_url") or original
+
+    if variant == "large":
+        return large
+
+    if variant == "sample":
+        asset = post.get("media_asset") or {}
+        by_type = {v.get("type"): v.get("url") for v in asset.get("variants") or []}
+        return by_type.get("sample") or by_type.get("720x720") or large
+
+    if variant == "best_under":
+        if post.get("file_size", 0) <= VARIANT_MAX_MB * 1024 * 1024:
+            return original
+        return large
+
+    return original
+
 # =========================
 # 스킵 관련 설정
 # =========================
@@ -101,18 +165,11 @@ def get_total_count_by_pages(artist: str, log_path: str = "") -> int:
             "tags": artist,
             "limit": LIMIT,
             "page": page,
+            "only": "id",
         }
-        if LOGIN and API_KEY:
-            params["login"] = LOGIN
-            params["api_key"] = API_KEY
 
         try:
-            r = requests.get(
-                BASE_URL,
-                params=params,
-                headers=HEADERS,
-                timeout=(5, 15),
-            )
+            r = api_get(BASE_URL, params=params, timeout=(5, 15))
             if r.status_code != 200:
                 return None
             data = r.json()
@@ -173,6 +230,265 @@ def get_total_count_by_pages(artist: str, log_path: str = "") -> int:
     total = (last_page - 1) * LIMIT + last_count
     return total
 
+# =========================
+# id 기반 페이지 지정 (cursor)
+# =========================
+def cursor_page(post_id: int, ascending: bool = False) -> str:
+    """
+    b<id>: id 보다 작은 글 (최신 → 과거 방향)
+    a<id>: id 보다 큰 글 (과거 → 최신 방향)
+    """
+    return f"{'a' if ascending else 'b'}{post_id}"
+
+
+def next_cursor(posts: list, ascending: bool = False) -> int | None:
+    ids = [p["id"] for p in posts if isinstance(p.get("id"), int)]
+    if not ids:
+        return None
+    return max(ids) if ascending else min(ids)
+
+
+# =========================
+# 페이지 producer → 다운로드 루프 메시지 종류
+# =========================
+PAGE_POSTS = "posts"
+PAGE_END = "end"
+PAGE_STOP = "stop"
+PAGE_FAILED = "failed"
+
+
+# =========================
+# 파일 1개 다운로드
+# - <파일>.part 에 받고, 다 받으면 최종 이름으로 교체 (os.replace)
+# - 남아 있는 .part 는 Range 요청으로 이어받기
+# - 받는 동안 md5 를 같이 계산해서 post 의 file_size / md5 와 비교
+# =========================
+CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-\d+/(\d+|\*)")
+
+# _download_file_once 결과
+FETCH_OK = "ok"
+FETCH_PARTIAL = "partial"   # 덜 받음 → .part 이어받기
+FETCH_CORRUPT = "corrupt"   # 크기/md5 불일치 → 격리 후 처음부터
+FETCH_ERROR = "error"       # HTTP 오류 → 포기
+
+
+def _range_start(img) -> int | None:
+    m = CONTENT_RANGE.match(img.headers.get("Content-Range", ""))
+    return int(m.group(1)) if m else None
+
+
+def _download_file_once(file_url: str, fpath: str, file_size: int, md5: str | None) -> str:
+    timeout = calc_timeout(file_size)
+    part = fpath + PART_SUFFIX
+    verify = VERIFY_MD5 and bool(md5)
+
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+    if file_size and offset >= file_size:
+        # 크기가 맞지 않는 찌꺼기 → 처음부터
+        offset = 0
+
+    # 이어받기 위치가 안 맞으면 (206 다른 시작 / 416) .part 를 버리고 같은 시도 안에서 처음부터
+    while True:
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+
+        with file_get(file_url, timeout=timeout, headers=headers) as img:
+            if offset and img.status_code == 206 and _range_start(img) == offset:
+                mode = "ab"
+                # 이어받을 때는 이미 받은 앞부분만 한 번 읽어 해시에 반영
+                h = hash_file(part) if verify else None
+            elif img.status_code == 200:
+                # Range 를 무시한 서버 → 처음부터
+                mode = "wb"
+                h = hashlib.md5() if verify else None
+            elif offset and img.status_code in (206, 416):
+                if os.path.exists(part):
+                    os.remove(part)
+                offset = 0
+                continue
+            else:
+                return FETCH_ERROR
+
+            # ❌ 다운로드 중에는 stop_event 검사 안 함
+            received = 0
+            write_time = 0.0
+            with open(part, mode) as f:
+                for chunk in img.iter_content(8192):
+                    if chunk:
+                        t = time.monotonic()
+                        f.write(chunk)
+                        write_time += time.monotonic() - t
+                        received += len(chunk)
+                        if h is not None:
+                            h.update(chunk)
+        break
+
+    metrics = get_metrics()
+    metrics.inc("download_bytes_total", received)
+    metrics.observe("disk_write_seconds", write_time)
+
+    size = os.path.getsize(part)
+
+    # 연결이 중간에 끊겨 덜 받았으면 .part 를 남겨 두고 다음에 이어받기
+    if file_size and size < file_size:
+        return FETCH_PARTIAL
+
+    if (file_size and size != file_size) or (h is not None and h.hexdigest() != md5):
+        return FETCH_CORRUPT
+
+    os.replace(part, fpath)
+    return FETCH_OK
+
+
+# =========================
+# 큰 파일: Range 구간 병렬 다운로드
+# =========================
+def _fetch_segment(file_url: str, part: str, start: int, end: int, timeout) -> bool:
+    with file_get(file_url, timeout=timeout, headers={"Range": f"bytes={start}-{end}"}) as img:
+        # Range 를 안 지키는 서버면 구간 방식 포기
+        if img.status_code != 206 or _range_start(img) != start:
+            return False
+
+        written = 0
+        write_time = 0.0
+        with open(part, "r+b") as f:
+            f.seek(start)
+            for chunk in img.iter_content(64 * 1024):
+                if chunk:
+                    t = time.monotonic()
+                    f.write(chunk)
+                    write_time += time.monotonic() - t
+                    written += len(chunk)
+
+    metrics = get_metrics()
+    metrics.inc("download_bytes_total", written)
+    metrics.observe("disk_write_seconds", write_time)
+
+    return written == end - start + 1
+
+
+def _download_segmented(file_url: str, fpath: str, file_size: int, md5: str | None) -> str | None:
+    """
+    file_size 만큼 미리 잡아 둔 .part 에 SEGMENT_COUNT 개 구간을 동시에 기록
+    구간이 순서대로 오지 않으므로 md5 는 다 받은 뒤 한 번 읽어서 검증
+
+    반환: FETCH_OK / FETCH_CORRUPT, 구간 방식이 안 되면 None (.part 삭제 → 단일 스트림으로)
+    """
+    part = fpath + PART_SUFFIX
+    timeout = calc_timeout(file_size // SEGMENT_COUNT)
+
+    with open(part, "wb") as f:
+        f.truncate(file_size)
+
+    step = -(-file_size // SEGMENT_COUNT)
+    ranges = [
+        (start, min(start + step, file_size) - 1)
+        for start in range(0, file_size, step)
+    ]
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="segment") as pool:
+            results = list(pool.map(
+                lambda r: _fetch_segment(file_url, part, r[0], r[1], timeout),
+                ranges,
+            ))
+    except Exception:
+        results = [False]
+
+    if not all(results):
+        try:
+            os.remove(part)
+        except OSError:
+            pass
+        return None
+
+    if VERIFY_MD5 and md5 and hash_file(part).hexdigest() != md5:
+        return FETCH_CORRUPT
+
+    os.replace(part, fpath)
+    return FETCH_OK
+
+
+def _download_file(file_url: str, fpath: str, file_size: int, md5: str | None = None) -> bool:
+    """
+    (성공 시 True, HTTP 오류/재시도 초과면 False, 마지막 시도의 네트워크 예외는 그대로 올림)
+
+    - SEGMENT_THRESHOLD_MB 이상: 먼저 Range 구간 병렬, 안 되면 아래 단일 스트림
+    - 끊김(예외/덜 받음): FILE_RESUME_RETRIES 번까지 .part 에서 이어받기
+    - 검증 실패: .part 를 격리하고 처음부터 다시
+    """
+    part = fpath + PART_SUFFIX
+
+    # 큰 파일은 구간 병렬 (이어받을 .part 가 있으면 단일 스트림 이어받기 우선)
+    if file_size and file_size >= SEGMENT_THRESHOLD_MB * 1024 * 1024 and SEGMENT_COUNT > 1:
+        if not os.path.exists(part):
+            result = _download_segmented(file_url, fpath, file_size, md5)
+            if result == FETCH_OK:
+                return True
+            if result == FETCH_CORRUPT:
+                quarantine(part)
+
+    for attempt in range(FILE_RESUME_RETRIES + 1):
+        try:
+            result = _download_file_once(file_url, fpath, file_size, md5)
+        except Exception:
+            if attempt >= FILE_RESUME_RETRIES:
+                raise
+            continue
+
+        if result == FETCH_OK:
+            return True
+        if result == FETCH_ERROR:
+            return False
+        if result == FETCH_CORRUPT:
+            quarantine(part)
+
+    return False
+
+
+# =========================
+# 작품 수가 적은 작가 묶음 조회
+# "~a ~b ..." 검색 1번 → tag_string_artist 로 작가별 분배
+# =========================
+def fetch_batch_posts(artists: list[str], log_path: str, variant: str = "original") -> dict[str, list] | None:
+    """
+    반환: {artist: [post, ...]} (최신 → 과거 순서)
+    요청이 거부되면 (태그 수 제한 등) None → 호출 측에서 작가별로 처리
+    """
+    by_tag = {a.strip().lower(): a for a in artists}
+    routed = {a: [] for a in artists}
+    tags = " ".join(f"~{t}" for t in by_tag)
+
+    cursor = None
+    while True:
+        params = {
+            "tags": tags,
+            "limit": LIMIT,
+            "page": cursor_page(cursor) if cursor is not None else 1,
+            "only": POST_FIELDS + ",tag_string_artist" + VARIANT_FIELDS.get(variant, ""),
+        }
+        try:
+            r = api_get(BASE_URL, params=params, timeout=(5, 15))
+            if r.status_code != 200:
+                log_write(log_path, "INFO", f"[batch] {tags} : HTTP {r.status_code} → per-artist")
+                return None
+            page_posts = r.json()
+        except Exception as e:
+            log_write(log_path, "ERROR", f"[batch] {tags} : posts request failed ({e})")
+            return None
+
+        if not page_posts:
+            return routed
+
+        for post in page_posts:
+            for tag in (post.get("tag_string_artist") or "").split():
+                if tag in by_tag:
+                    routed[by_tag[tag]].append(post)
+
+        cursor = next_cursor(page_posts)
+        if cursor is None or len(page_posts) < LIMIT:
+            return routed
+
+
 # =========================
 # 작가 다운로드
 # =========================
@@ -185,163 +501,487 @@ def download_artist(
     ui_cb=None,
     stop_event=None,
     overwrite: bool = False,
+    sync_state=None,
+    index=None,
+    snapshot=None,
+    variant: str = "original",
+    posts=None,
 ) -> Tuple[bool, int]:
+    """
+    페이지 단위로 목록을 받고, 한 페이지의 새 파일들은
+    FILE_WORKERS 개의 워커가 동시에 다운로드한다.
+
+    - 기존 파일 판단 / 스킵 streak 계산은 호출 스레드에서 순서대로
+    - downloaded / encountered_exist 카운터와 ui_cb 호출은 lock 안에서
+    - 페이지가 끝날 때마다 그 페이지의 다운로드가 모두 끝날 때까지 대기
+    - 다음 페이지 목록은 별도 스레드가 PAGE_PREFETCH 개까지 미리 받아 둠
+    - PAGE_MODE="cursor" 면 2페이지부터 page=b<id>, 실패하면 숫자 페이지로 전환
+    - sync_state 가 있으면 watermark 보다 큰 id 만 조회하고,
+      끝까지 처리했을 때 본 가장 큰 id 를 새 watermark 로 기록
+    - index(DownloadIndex) 가 있으면 기존 파일 판단은 인덱스의 파일명 set 으로,
+      받은 파일은 인덱스에 기록
+    - 인덱스가 없으면 snapshot(DirSnapshot, 폴더 1회 scandir) 으로 판단
+      (호출 측에서 기존 파일 수를 셀 때 만든 것을 넘겨받아 재사용)
+    - DEDUP_BY_MD5 면 다른 폴더에 같은 md5 파일이 있을 때 다운로드 대신 링크
+    - variant 가 original 이 아니면 _<variant> 폴더에 저장하고
+      watermark 도 variant 별로 따로 관리 (검증/중복 링크는 원본만)
+    - posts 가 주어지면 (묶음 조회 결과) API 조회 없이 그 목록만 처리
+    - 페이지가 (실패 없이) 끝날 때마다 다음 페이지 위치를 checkpoint 로 기록,
+      중지/강제 종료 후 다음 실행은 1페이지가 아니라 그 위치부터 이어서 조회
+    """
 
-    page = 1
     downloaded = 0
 
+    # 작가별 요약 (로그 1줄) / 실행 전체 지표
+    started = time.monotonic()
+    metrics = get_metrics()
+    linked = 0
+    received_bytes = 0
+    api_calls = 0
+
+    # cursor 페이지 상태 (None = 첫 페이지)
+    use_cursor = (PAGE_MODE == "cursor")
+    ascending = False
+    cursor = None
+    start_page = 1
+
+    is_original = (variant == "original")
+
+    # 증분 동기화: 지난 실행 이후 새 글만 (덮어쓰기 모드는 전체)
+    sync_key = artist if is_original else f"{artist}#{variant}"
+    since_id = 0
+    if sync_state is not None and not overwrite:
+        since_id = sync_state.get_watermark(sync_key)
+
+    # 이전 실행이 중간에 멈췄으면 그 위치부터 (묶음 조회/덮어쓰기는 처음부터)
+    checkpoint = None
+    if sync_state is not None and not overwrite and posts is None:
+        checkpoint = sync_state.get_checkpoint(sync_key)
+        if checkpoint is not None:
+            since_id = int(checkpoint.get("since_id", 0))
+
+    # 숫자 페이지로 조회할 때 붙이는 id:> 하한 (cursor 조회는 a<id> 가 대신 거름)
+    min_id = since_id
+
+    if since_id > 0 and use_cursor:
+        # page=a<id> : id 보다 큰 글을 과거 → 최신 방향으로
+        ascending = True
+        cursor = since_id
+
+    # 이번 실행에서 본 가장 큰 id / 중지·실패 여부 (watermark 갱신 조건)
+    max_seen_id = 0
+    stopped = False
+    file_errors = 0
+    pages_done = 0
+
+    if checkpoint is not None:
+        use_cursor = bool(checkpoint.get("use_cursor")) and use_cursor
+        cursor = checkpoint.get("cursor") if use_cursor else None
+        min_id = int(checkpoint.get("min_id", since_id))
+        start_page = int(checkpoint.get("page", 1))
+        max_seen_id = int(checkpoint.get("max_seen_id", 0))
+        pages_done = int(checkpoint.get("pages", 0))
+        log_write(log_path, "INFO", f"{artist} : resume from checkpoint (after {pages_done} page(s))")
+
     # 🔒 UI 기준값 (고정)
     initial_exist = initial_exist_count
 
     # 🔥 스캔 중 다시 발견한 기존 파일 수 (괄호용)
     encountered_exist = 0
 
+    # 이어서 하는 경우 앞 페이지에서 확인한 기존 파일 수부터
+    # (앞에서 받은 파일은 initial_exist 에 이미 포함되므로 downloaded 는 0 부터)
+    if checkpoint is not None:
+        encountered_exist = int(checkpoint.get("exist", 0))
+
     # 스킵 판단용
     exist_skip_streak = 0
 
+    # 워커 스레드와 공유하는 카운터 보호용
+    lock = threading.Lock()
+
     def owned_ratio() -> float:
         if total_count <= 0:
             return 0.0
         return (initial_exist + downloaded) / total_count
     
-    safe_name = sanitize_folder_name(artist)
-    save_dir = os.path.join(base_dir, safe_name)
+    save_dir = artist_save_dir(base_dir, artist, variant)
     save_dir_created = False
 
-    while True:
-        # 페이지 단위 중지 확인
-        if stop_event and stop_event.is_set():
-            log_write(log_path, "INFO", f"{artist} : stop requested (page end)")
-            break
+    # 인덱스에 기록된 이 폴더의 파일명 (작가당 1번 조회)
+    known = index.names(save_dir) if index is not None else None
+
+    # 인덱스가 없으면 폴더를 한 번만 읽어서 판단
+    if snapshot is None and index is None:
+        snapshot = DirSnapshot(save_dir)
+
+    def record(post: dict, fname: str):
+        if snapshot is not None:
+            snapshot.add(fname)
+        if index is None:
+            return
+        index.add(
+            save_dir,
+            fname,
+            artist=artist,
+            post_id=post.get("id"),
+            md5=post.get("md5") if is_original else None,
+            size=post.get("file_size") if is_original else None,
+        )
+        known.add(fname)
+
+    def file_exists(post: dict, fname: str, fpath: str) -> bool:
+        if known is not None and fname in known:
+            return True
+
+        if snapshot is not None:
+            found = fname in snapshot
+        else:
+            found = os.path.exists(fpath)
 
-        params = {
-            "tags": artist,
-            "limit": LIMIT,
-            "page": page,
-        }
-        if LOGIN and API_KEY:
-            params["login"] = LOGIN
-            params["api_key"] = API_KEY
+        # 인덱스 이전에 받은 파일 → 인덱스에 보충
+        if found and index is not None:
+            record(post, fname)
+        return found
+
+    def link_duplicate(post: dict, fpath: str) -> str | None:
+        if index is None or not DEDUP_BY_MD5 or not is_original:
+            return None
+
+        # 덮어쓰기 / 이미 있는 파일은 링크로 바꾸지 않음 (원본을 다시 받음)
+        if overwrite or os.path.lexists(fpath):
+            return None
+
+        for src in index.find_by_md5(post.get("md5")):
+            if os.path.normpath(src) == os.path.normpath(fpath):
+                continue
+            if not os.path.isfile(src):
+                continue
+            method = link_existing(src, fpath)
+            if method:
+                log_write(log_path, "INFO", f"{artist} : {os.path.basename(fpath)} ← {method} {src}")
+                return method
+        return None
 
+    def fetch_file(post: dict, fname: str, file_url: str, fpath: str):
+        nonlocal downloaded, file_errors, linked, received_bytes
+
+        # 큐에서 대기하던 파일: 시작 전에 중지 확인
+        if stop_event and stop_event.is_set():
+            return
+
+        is_link = False
         try:
-            r = requests.get(
-                BASE_URL,
-                params=params,
-                headers=HEADERS,
-                timeout=(5, 15),
+            # 다른 작가 폴더에 이미 있는 파일이면 링크로 끝
+            is_link = bool(link_duplicate(post, fpath))
+            ok = is_link or _download_file(
+                file_url,
+                fpath,
+                post.get("file_size", 0) if is_original else 0,
+                post.get("md5") if is_original else None,
             )
         except Exception as e:
-            log_write(log_path, "ERROR", f"{artist} : posts request failed ({e})")
-            return False, downloaded
+            log_write(
+                log_path,
+                "ERROR",
+                f"{artist} : download failed {fname} ({e})",
+            )
+            ok = False
+
+        if not ok:
+            metrics.inc("files_total", result="failed")
+            with lock:
+                file_errors += 1
+            return
+
+        record(post, fname)
+        size = 0 if is_link else os.path.getsize(fpath)
+        metrics.inc("files_total", result="linked" if is_link else "downloaded")
+
+        with lock:
+            downloaded += 1
+            if is_link:
+                linked += 1
+            received_bytes += size
+
+            if ui_cb:
+                ui_cb(
+                    downloaded,
+                    initial_exist,
+                    encountered_exist,
+                    total_count
+                )
 
-        if r.status_code != 200:
-            log_write(log_path, "ERROR", f"{artist} : HTTP {r.status_code}")
-            return False, downloaded
+    # -------------------------
+    # 페이지 목록 선행 조회 (producer)
+    # 파일을 받는 동안 다음 페이지들을 미리 받아 큐에 넣는다
+    # -------------------------
+    pages = queue.Queue(maxsize=max(1, PAGE_PREFETCH))
+    halt = threading.Event()
 
-        posts = r.json()
-        if not posts:
-            break
+    # 첫 페이지에서 받을 파일이 생기기 전까지는 선행 조회 안 함
+    # (다 가진 작가가 스킵 streak 로 끝날 때 쓸데없는 페이지 요청 방지)
+    prefetch_ok = threading.Event()
+
+    def put_page(item) -> bool:
+        while not halt.is_set():
+            try:
+                pages.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce_pages():
+        nonlocal use_cursor, cursor, min_id, api_calls
+        page = start_page
+        use_filetype = SERVER_FILETYPE_FILTER
+
+        # 이미 받아 둔 목록 (묶음 조회)
+        if posts is not None:
+            if posts:
+                put_page((PAGE_POSTS, posts, None))
+            put_page((PAGE_END, None, None))
+            return
+
+        try:
+            while not halt.is_set():
+                if page > start_page:
+                    prefetch_ok.wait()
+                    if halt.is_set():
+                        return
+
+                if stop_event and stop_event.is_set():
+                    put_page((PAGE_STOP, None, None))
+                    return
+
+                by_cursor = use_cursor and cursor is not None
+                tags = f"{artist} id:>{min_id}" if min_id > 0 and not by_cursor else artist
+
+                params = {
+                    "tags": f"{tags} {FILETYPE_TAG}" if use_filetype else tags,
+                    "limit": LIMIT,
+                    "page": cursor_page(cursor, ascending) if by_cursor else page,
+                    "only": POST_FIELDS + VARIANT_FIELDS.get(variant, ""),
+                }
+
+                api_calls += 1
+                try:
+                    r = api_get(BASE_URL, params=params, timeout=(5, 15))
+                except Exception as e:
+                    log_write(log_path, "ERROR", f"{artist} : posts request failed ({e})")
+                    put_page((PAGE_FAILED, None, None))
+                    return
+
+                if r.status_code == 422 and use_filetype:
+                    # 검색 태그 수 제한 등 → filetype 필터 빼고 다시
+                    log_write(log_path, "INFO", f"{artist} : filetype filter rejected → client-side filter only")
+                    use_filetype = False
+                    continue
+
+                if r.status_code != 200 and use_cursor and cursor is not None and not ascending:
+                    # cursor 페이지 거부 → 같은 위치를 숫자 페이지로 다시 요청
+                    log_write(log_path, "INFO", f"{artist} : cursor page HTTP {r.status_code} → numeric paging")
+                    use_cursor = False
+                    continue
+
+                if r.status_code != 200:
+                    log_write(log_path, "ERROR", f"{artist} : HTTP {r.status_code}")
+                    put_page((PAGE_FAILED, None, None))
+                    return
+
+                page_posts = r.json()
+                if not page_posts:
+                    put_page((PAGE_END, None, None))
+                    return
+
+                page += 1
+
+                if use_cursor:
+                    last_cursor = cursor
+                    cursor = next_cursor(page_posts, ascending)
+                    if cursor is None:
+                        log_write(log_path, "INFO", f"{artist} : no post id for cursor → numeric paging")
+                        use_cursor = False
+                        if ascending and last_cursor:
+                            # 숫자 페이지는 최신 → 과거 순서라 위치가 맞지 않음
+                            # → 지금까지 본 id 위쪽만 1페이지부터
+                            min_id = max(min_id, last_cursor)
+                            page = 1
+
+                # 이 페이지가 끝나면 이어서 조회할 위치 (checkpoint 용)
+                resume_at = {"use_cursor": use_cursor, "cursor": cursor, "page": page, "min_id": min_id}
+                if not put_page((PAGE_POSTS, page_posts, resume_at)):
+                    return
 
-        for post in posts:
-            # 새 이미지 시작 전 중지 확인
+        except Exception as e:
+            log_write(log_path, "ERROR", f"{artist} : posts request failed ({e})")
+            put_page((PAGE_FAILED, None, None))
+
+    failed = False
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, FILE_WORKERS),
+        thread_name_prefix="file",
+    )
+    producer = threading.Thread(target=produce_pages, daemon=True, name="pages")
+    producer.start()
+
+    try:
+        while True:
+            # 페이지 단위 중지 확인
             if stop_event and stop_event.is_set():
-                log_write(log_path, "INFO", f"{artist} : stop requested (before new image)")
-                return downloaded > 0, downloaded
+                log_write(log_path, "INFO", f"{artist} : stop requested (page end)")
+                stopped = True
+                break
 
-            file_url = post.get("file_url")
-            if not file_url:
-                continue
+            kind, page_posts, resume_at = pages.get()
 
-            file_url += "?download=1"
-            fname = file_url.split("/")[-1].split("?")[0]
-            ext = os.path.splitext(fname.lower())[1]
+            if kind == PAGE_STOP:
+                log_write(log_path, "INFO", f"{artist} : stop requested (page end)")
+                stopped = True
+                break
 
-            if ext not in ALLOWED_EXT:
-                continue
+            if kind == PAGE_FAILED:
+                failed = True
+                break
 
-            if not save_dir_created:
-                os.makedirs(save_dir, exist_ok=True)
-                save_dir_created = True
-
-            fpath = os.path.join(save_dir, fname)
-
-            # -------------------------
-            # 이미 파일이 있는 경우
-            # -------------------------
-            if os.path.exists(fpath) and not overwrite:
-                encountered_exist += 1
-
-                # 90% 이상일 때만 스킵 카운트 증가
-                if owned_ratio() >= OWNED_RATIO_THRESHOLD:
-                    exist_skip_streak += 1
-                    if exist_skip_streak >= MAX_EXIST_SKIP:
-                        log_write(
-                            log_path,
-                            "INFO",
-                            f"{artist} : owned {owned_ratio():.1%}, exist streak reached → skip artist"
-                        )
-                        return downloaded > 0, downloaded
-                else:
-                    # 90% 미만이면 스킵 로직 완전 비활성
-                    exist_skip_streak = 0
-
-                if ui_cb:
-                    ui_cb(
-                        downloaded,
-                        initial_exist,
-                        exist_skip_streak,
-                        total_count
-                    )
-                continue
+            if kind == PAGE_END:
+                break
 
-            # -------------------------
-            # 새 파일 다운로드
-            # -------------------------
-            exist_skip_streak = 0
+            page_max_id = next_cursor(page_posts, ascending=True)
+            if page_max_id is not None:
+                max_seen_id = max(max_seen_id, page_max_id)
 
-            try:
-                file_size = post.get("file_size", 0)
-                timeout = calc_timeout(file_size)
+            pending = []
+            stop_artist = False
 
-                headers = dict(HEADERS)
-                headers["Referer"] = "https://danbooru.donmai.us/"
+            for post in page_posts:
+                # 새 이미지 시작 전 중지 확인
+                if stop_event and stop_event.is_set():
+                    log_write(log_path, "INFO", f"{artist} : stop requested (before new image)")
+                    stopped = True
+                    stop_artist = True
+                    break
 
-                img = requests.get(
-                    file_url,
-                    headers=headers,
-                    stream=True,
-                    timeout=timeout,
-                )
+                file_url = pick_variant_url(post, variant)
+                if not file_url:
+                    continue
 
-                if img.status_code != 200:
+                file_url += "?download=1"
+                fname = file_url.split("/")[-1].split("?")[0]
+                ext = os.path.splitext(fname.lower())[1]
+
+                if ext not in ALLOWED_EXT:
                     continue
 
-                # ❌ 다운로드 중에는 stop_event 검사 안 함
-                with open(fpath, "wb") as f:
-                    for chunk in img.iter_content(8192):
-                        if chunk:
-                            f.write(chunk)
-
-                downloaded += 1
-
-                if ui_cb:
-                    ui_cb(
-                        downloaded,
-                        initial_exist,
-                        encountered_exist,
-                        total_count
-                    )
-
-                time.sleep(SLEEP_FILE)
-
-            except Exception as e:
-                log_write(
-                    log_path,
-                    "ERROR",
-                    f"{artist} : download failed {fname} ({e})",
-                )
+                if not save_dir_created:
+                    os.makedirs(save_dir, exist_ok=True)
+                    save_dir_created = True
+
+                fpath = os.path.join(save_dir, fname)
+
+                # -------------------------
+                # 이미 파일이 있는 경우
+                # -------------------------
+                if not overwrite and file_exists(post, fname, fpath):
+                    metrics.inc("files_total", result="exist")
+                    with lock:
+                        encountered_exist += 1
+
+                        # 90% 이상일 때만 스킵 카운트 증가
+                        if owned_ratio() >= OWNED_RATIO_THRESHOLD:
+                            exist_skip_streak += 1
+                            if exist_skip_streak >= MAX_EXIST_SKIP:
+                                log_write(
+                                    log_path,
+                                    "INFO",
+                                    f"{artist} : owned {owned_ratio():.1%}, exist streak reached → skip artist"
+                                )
+                                stop_artist = True
+                                break
+                        else:
+                            # 90% 미만이면 스킵 로직 완전 비활성
+                            exist_skip_streak = 0
+
+                        if ui_cb:
+                            ui_cb(
+                                downloaded,
+                                initial_exist,
+                                exist_skip_streak,
+                                total_count
+                            )
+                    continue
 
-        page += 1
-        time.sleep(SLEEP_PAGE)
+                # -------------------------
+                # 새 파일 다운로드 (워커에 위임)
+                # -------------------------
+                exist_skip_streak = 0
+                prefetch_ok.set()
+
+                pending.append(pool.submit(
+                    fetch_file,
+                    post,
+                    fname,
+                    file_url,
+                    fpath,
+                ))
+
+            # 이 페이지에서 맡긴 파일이 모두 끝날 때까지 대기
+            wait(pending)
+
+            if stop_artist:
+                break
+
+            # 대기 중 중지 → 큐에 남았던 파일은 안 받았으므로 이 페이지는 미완료
+            if stop_event and stop_event.is_set():
+                log_write(log_path, "INFO", f"{artist} : stop requested (page end)")
+                stopped = True
+                break
+
+            pages_done += 1
+
+            # 페이지 경계 checkpoint (실패한 파일이 생긴 뒤로는 전진하지 않음)
+            if sync_state is not None and not overwrite and resume_at is not None and not file_errors:
+                sync_state.set_checkpoint(sync_key, {
+                    **resume_at,
+                    "since_id": since_id,
+                    "max_seen_id": max_seen_id,
+                    "pages": pages_done,
+                    "exist": encountered_exist,
+                })
+
+            prefetch_ok.set()
+
+    finally:
+        # producer 정지 → 진행 중인 파일 마무리
+        halt.set()
+        prefetch_ok.set()
+        pool.shutdown(wait=True)
+        producer.join()
+
+    elapsed = time.monotonic() - started
+    fetched = downloaded - linked
+    log_write(
+        log_path,
+        "INFO",
+        f"{artist} : summary new {fetched} · linked {linked} · exist {encountered_exist}"
+        f" · failed {file_errors} · api {api_calls} · {received_bytes / (1024 * 1024):.1f}MB"
+        f" · {elapsed:.1f}s ({fetched / max(elapsed, 1e-6):.2f} files/s)",
+    )
+
+    # 조회 실패 / 중지: checkpoint 를 남겨 두고 다음 실행에서 이어서
+    if failed:
+        return False, downloaded
+
+    if stopped or (stop_event and stop_event.is_set()):
+        return downloaded > 0, downloaded
+
+    # 끝까지 (또는 스킵 조건까지) 처리했고 실패한 파일이 없을 때만 watermark 전진
+    if sync_state is not None:
+        if file_errors:
+            log_write(log_path, "INFO", f"{artist} : {file_errors} file(s) failed → watermark kept")
+        elif max_seen_id > 0:
+            sync_state.set_watermark(sync_key, max_seen_id)
+        sync_state.clear_checkpoint(sync_key)
 
     return downloaded > 0, downloaded
@@ -0,0 +1,413 @@
+import os
+import threading
+from collections import deque
+
+from config import (
+    ARTIST_WORKERS,
+    USE_DOWNLOAD_INDEX,
+    BATCH_SMALL_ARTISTS,
+    BATCH_SMALL_MAX_POSTS,
+    BATCH_SIZE,
+    SCHEDULE_POLICY,
+    METRICS_EXPORT,
+    METRICS_EXPORT_INTERVAL,
+)
+from core.artist_list import (
+    parse_artist_file,
+    read_completed,
+    append_completed,
+    remove_completed,
+    list_file_paths,
+)
+from core.dir_snapshot import DirSnapshot
+from core.download_index import DownloadIndex
+from core.metrics import get_metrics
+from core.downloader import (
+    download_artist,
+    artist_save_dir,
+    fetch_batch_posts,
+    sanitize_folder_name,
+)
+from core.post_count import CountCache, get_total_count, prefetch_post_counts
+from core.scheduling import order_pairs
+from core.sync_state import SyncState
+from core.verify import verify_library
+from utils.logger import log_write, flush_logs
+
+
+# =========================
+# 진행 이벤트 (on_event(kind, data) 로 전달, 워커 스레드에서 호출됨)
+# =========================
+EVENT_COUNTING = "counting"            # {}
+EVENT_TOTAL = "total"                  # {done, artists, posts_done, posts_total}
+EVENT_SLOT_START = "slot_start"        # {slot, artist, save_dir, initial_exist, total}
+EVENT_SLOT_PROGRESS = "slot_progress"  # {slot, downloaded, initial_exist, found_exist, total}
+EVENT_ARTIST_DONE = "artist_done"      # {slot, artist, ok, downloaded, done}
+EVENT_FINISHED = "finished"            # {done, artists, report}
+
+
+def _plan_queue(pairs, counts: dict) -> list:
+    """
+    작업 단위 목록 만들기
+    - 단위 1개 = [(artist, base_dir), ...]
+    - 작품 수가 BATCH_SMALL_MAX_POSTS 이하인 작가는 BATCH_SIZE 명씩 묶음 (묶음 조회)
+    - 나머지는 1명짜리 단위 (순서는 목록 순서 유지)
+    """
+    if not BATCH_SMALL_ARTISTS or BATCH_SIZE < 2:
+        return [[pair] for pair in pairs]
+
+    units = []
+    open_batch = {}  # base_dir → 채우는 중인 묶음
+
+    for artist, base_dir in pairs:
+        count = counts.get(artist)
+        small = (
+            count is not None
+            and 0 <= count <= BATCH_SMALL_MAX_POSTS
+            and " " not in artist.strip()
+        )
+        if not small:
+            units.append([(artist, base_dir)])
+            continue
+
+        batch = open_batch.get(base_dir)
+        if batch is None or len(batch) >= BATCH_SIZE:
+            batch = []
+            open_batch[base_dir] = batch
+            units.append(batch)
+        batch.append((artist, base_dir))
+
+    return units
+
+
+def _existing_counts(pairs, variant: str, index) -> dict:
+    """
+    작가별 이미 가진 파일 수 (정렬 정책용)
+    - 인덱스에 기록된 폴더는 인덱스 값 (쿼리 1번)
+    - 인덱스가 없거나 인덱스에 없는 폴더(인덱스 이전 라이브러리)는 폴더를 1번 읽어서
+    """
+    by_dir = index.counts_by_dir() if index is not None else {}
+
+    existing = {}
+    for artist, base_dir in pairs:
+        save_dir = os.path.normpath(artist_save_dir(base_dir, artist, variant))
+        n = by_dir.get(save_dir, 0)
+        if n == 0 and os.path.isdir(save_dir):
+            n = len(DirSnapshot(save_dir))
+        existing[artist] = n
+    return existing
+
+
+# =========================
+# 다운로드 엔진 (UI 없음)
+# =========================
+class DownloadEngine:
+    """
+    작가 목록 1개를 처리하는 실행 루프.
+    GUI / CLI 는 on_event 로 진행 상황만 받아서 표시한다.
+
+    - stop_event: 설정되면 새 작가/이미지 시작 안 함 (downloader 정책대로 마무리)
+    - stop_after: 설정되면 진행 중인 작가만 끝내고 새 작가는 시작 안 함
+    """
+
+    def __init__(
+        self,
+        list_path: str,
+        pairs=None,
+        overwrite: bool = False,
+        variant: str = "original",
+        policy: str = SCHEDULE_POLICY,
+        slots: int = ARTIST_WORKERS,
+        on_event=None,
+        stop_event=None,
+    ):
+        paths = list_file_paths(list_path)
+        self.completed_path = paths["completed"]
+        self.log_path = paths["log"]
+        self.count_cache_path = paths["counts"]
+        self.sync_path = paths["sync"]
+        self.index_path = paths["index"]
+        self.metrics_path = f"{paths['metrics']}.{METRICS_EXPORT}" if METRICS_EXPORT else None
+
+        self.pairs = list(pairs) if pairs is not None else parse_artist_file(list_path)
+        self.overwrite = overwrite
+        self.variant = variant
+        self.policy = policy
+        self.slots = max(1, slots)
+
+        self.on_event = on_event
+        self.stop_event = stop_event or threading.Event()
+        self.stop_after = threading.Event()
+
+    def _emit(self, kind: str, **data):
+        if self.on_event:
+            self.on_event(kind, data)
+
+    def _halted(self) -> bool:
+        return self.stop_event.is_set() or self.stop_after.is_set()
+
+    def start(self) -> threading.Thread:
+        t = threading.Thread(target=self.run, daemon=True)
+        t.start()
+        return t
+
+    def _export_metrics(self, done: threading.Event):
+        """METRICS_EXPORT 파일을 주기적으로 갱신 (실행이 끝나면 마지막으로 1번 더)"""
+        metrics = get_metrics()
+        while not done.wait(METRICS_EXPORT_INTERVAL):
+            metrics.write_snapshot(self.metrics_path, METRICS_EXPORT)
+        metrics.write_snapshot(self.metrics_path, METRICS_EXPORT)
+
+    def run(self):
+        variant = self.variant
+        log_path = self.log_path
+
+        # 지표는 실행 단위로 집계
+        metrics = get_metrics()
+        metrics.reset()
+        run_done = threading.Event()
+        exporter = None
+        if self.metrics_path:
+            exporter = threading.Thread(target=self._export_metrics, args=(run_done,), daemon=True)
+            exporter.start()
+
+        completed = set(read_completed(self.completed_path))
+        count_cache = CountCache(self.count_cache_path)
+        sync_state = SyncState(self.sync_path)
+        index = DownloadIndex(self.index_path) if USE_DOWNLOAD_INDEX else None
+        pending = [
+            (artist, base_dir)
+            for artist, base_dir in self.pairs
+            if artist not in completed
+        ]
+        queue = deque()  # 작품 수 조회 후 _plan_queue 로 채움
+
+        # 슬롯 워커끼리 공유: 대기열 / 완료 기록 / 전체 진행 카운트
+        lock = threading.Lock()
+        progress = {
+            "done": len(completed),
+            "posts_done": 0,    # 끝난 작가들의 작품 수 합
+            "posts_total": 0,   # 목록 전체 작품 수 합 (미리 조회한 값 기준)
+        }
+        counts = {}
+        slot_owned = [0] * self.slots
+
+        def refresh_total():
+            with lock:
+                d = progress["done"]
+                posts = progress["posts_done"] + sum(slot_owned)
+                total = progress["posts_total"]
+            self._emit(EVENT_TOTAL, done=d, artists=len(self.pairs), posts_done=posts, posts_total=total)
+
+        def on_progress(slot, downloaded, initial_exist, found_exist, total):
+            if total and total > 0:
+                with lock:
+                    slot_owned[slot] = min(initial_exist + downloaded, total)
+            self._emit(
+                EVENT_SLOT_PROGRESS,
+                slot=slot,
+                downloaded=downloaded,
+                initial_exist=initial_exist,
+                found_exist=found_exist,
+                total=total,
+            )
+            refresh_total()
+
+        def run_artist(slot: int, artist: str, base_dir: str, posts=None):
+            save_dir = artist_save_dir(base_dir, artist, variant)
+            os.makedirs(save_dir, exist_ok=True)
+
+            # 인덱스 우선, 인덱스에 없는 폴더(인덱스 이전 파일)만 폴더를 1번 읽음
+            # → 그 목록(snapshot)을 다운로드 루프의 존재 확인에도 그대로 사용
+            snapshot = None
+            initial_exist = index.count(save_dir) if index is not None else 0
+            if initial_exist == 0:
+                snapshot = DirSnapshot(save_dir)
+                initial_exist = len(snapshot)
+
+            # 미리 조회한 값 우선, 없으면 (캐시 → 개별 조회 → 페이지 탐색)
+            total_count = counts.get(artist)
+            if total_count is None:
+                total_count = get_total_count(artist, log_path=log_path, cache=count_cache)
+                with lock:
+                    progress["posts_total"] += max(0, total_count)
+
+            self._emit(
+                EVENT_SLOT_START,
+                slot=slot,
+                artist=artist,
+                save_dir=save_dir,
+                initial_exist=initial_exist,
+                total=total_count,
+            )
+
+            # 다운로드 실행 (다운로더가 ui_cb로 계속 갱신)
+            ok, downloaded = download_artist(
+                artist=artist,
+                base_dir=base_dir,
+                log_path=log_path,
+                total_count=total_count,
+                initial_exist_count=initial_exist,
+                ui_cb=lambda d, init_e, found_e, t:
+                    on_progress(slot, d, init_e, found_e, t),
+                stop_event=self.stop_event,
+                overwrite=self.overwrite,
+                sync_state=sync_state,
+                index=index,
+                snapshot=snapshot,
+                variant=variant,
+                posts=posts,
+            )
+
+            # 완료 기록 (여러 슬롯이 같은 파일에 append → lock)
+            with lock:
+                if ok:
+                    append_completed(self.completed_path, artist)
+                    completed.add(artist)
+
+                progress["done"] += 1
+                done = progress["done"]
+                if total_count and total_count > 0:
+                    progress["posts_done"] += min(initial_exist + downloaded, total_count)
+                slot_owned[slot] = 0
+
+            self._emit(EVENT_ARTIST_DONE, slot=slot, artist=artist, ok=ok, downloaded=downloaded, done=done)
+            refresh_total()
+
+        def slot_worker(slot: int):
+            while True:
+                # 중지 / “이번 작가까지”: 진행 중인 작가만 마무리하고 새 작가는 시작 안 함
+                if self._halted():
+                    break
+
+                with lock:
+                    if not queue:
+                        break
+                    unit = queue.popleft()
+
+                # 작은 작가 묶음: 검색 1번으로 받아 작가별로 분배 (실패하면 작가별 조회)
+                routed = None
+                if len(unit) > 1:
+                    routed = fetch_batch_posts([a for a, _ in unit], log_path, variant)
+
+                for n, (artist, base_dir) in enumerate(unit):
+                    if n and self._halted():
+                        break
+
+                    posts = routed.get(artist) if routed is not None else None
+
+                    # 작품이 있는데 분배된 글이 없으면 (별칭 등) 단독 조회로
+                    if posts is not None and not posts and counts.get(artist, 0) > 0:
+                        posts = None
+
+                    run_artist(slot, artist, base_dir, posts)
+
+        try:
+            # 작품 수 일괄 조회 (작가별 조회를 다운로드 경로에서 제거)
+            self._emit(EVENT_COUNTING)
+            counts.update(prefetch_post_counts(
+                [artist for artist, _ in self.pairs],
+                count_cache,
+                log_path=log_path,
+                stop_event=self.stop_event,
+            ))
+
+            with lock:
+                progress["posts_total"] = sum(
+                    max(0, counts.get(artist, 0)) for artist, _ in self.pairs
+                )
+                progress["posts_done"] = sum(
+                    max(0, counts.get(artist, 0)) for artist in completed
+                )
+
+                # 처리 순서: 예상 남은 작업 기준 (API 호출 없음)
+                existing = {}
+                if self.policy != "file_order":
+                    existing = _existing_counts(pending, variant, index)
+                ordered = order_pairs(pending, self.policy, counts, existing)
+
+                queue.extend(_plan_queue(ordered, counts))
+            refresh_total()
+
+            threads = [
+                threading.Thread(target=slot_worker, args=(i,), daemon=True)
+                for i in range(self.slots)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        finally:
+            if index is not None:
+                index.close()
+
+            run_done.set()
+            if exporter is not None:
+                exporter.join()
+
+            report = metrics.report()
+            for line in report:
+                log_write(log_path, "INFO", f"[metrics] {line}")
+            flush_logs()
+
+            self._emit(EVENT_FINISHED, done=progress["done"], artists=len(self.pairs), report=report)
+
+
+# =========================
+# 1회성 작업 (인덱스 재구성 / 라이브러리 검증)
+# =========================
+def rebuild_index(list_path: str, pairs) -> int:
+    """인덱스를 디스크 기준으로 다시 만든다. 반환: 기록한 파일 수"""
+    paths = list_file_paths(list_path)
+    base_dirs = sorted({base_dir for _, base_dir in pairs})
+
+    index = DownloadIndex(paths["index"])
+    try:
+        total = sum(index.rebuild_from_disk(base_dir) for base_dir in base_dirs)
+    finally:
+        index.close()
+
+    log_write(paths["log"], "INFO", f"[index] rebuilt from disk: {total} files")
+    return total
+
+
+def verify_all(list_path: str, pairs, on_progress=None) -> tuple[int, int]:
+    """
+    저장된 파일 전체를 md5 로 다시 검증 (여러 코어 병렬).
+    손상 파일은 격리하고, 해당 작가는 완료/watermark 를 풀어 다음 실행에서 다시 받게 한다.
+    반환: (검사한 수, 손상 수)
+    """
+    paths = list_file_paths(list_path)
+    base_dirs = sorted({base_dir for _, base_dir in pairs})
+
+    checked = 0
+    bad = []
+    for base_dir in base_dirs:
+        c, b = verify_library(base_dir, on_progress=on_progress)
+        checked += c
+        bad.extend(b)
+
+    if bad:
+        folders = {os.path.basename(os.path.dirname(p)) for p in bad}
+        artists = [a for a, _ in pairs if sanitize_folder_name(a) in folders]
+
+        if USE_DOWNLOAD_INDEX:
+            index = DownloadIndex(paths["index"])
+            try:
+                for p in bad:
+                    index.remove(p)
+            finally:
+                index.close()
+
+        sync_state = SyncState(paths["sync"])
+        for artist in artists:
+            sync_state.clear_watermark(artist)
+            sync_state.clear_checkpoint(artist)
+        remove_completed(paths["completed"], artists)
+
+        for p in bad:
+            log_write(paths["log"], "ERROR", f"[verify] md5 mismatch → quarantined {p}")
+
+    log_write(paths["log"], "INFO", f"[verify] checked {checked} files, {len(bad)} corrupt")
+    return checked, len(bad)
@@ -0,0 +1,75 @@
+import os
+import sys
+
+from core.dir_snapshot import PART_SUFFIX
+
+# Linux FICLONE ioctl (btrfs / xfs 등 reflink 지원 파일 시스템)
+FICLONE = 0x40049409
+
+
+def _reflink(src: str, dst: str):
+    if not sys.platform.startswith("linux"):
+        raise OSError("reflink not supported on this platform")
+
+    import fcntl
+
+    # "xb": 이미 있는 파일은 절대 비우거나 지우지 않음
+    with open(src, "rb") as s, open(dst, "xb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.remove(dst)
+            raise
+
+
+def _symlink(src: str, dst: str):
+    # 상대 경로 그대로 두면 링크 폴더 기준으로 풀려서 깨진 링크가 됨
+    os.symlink(os.path.relpath(src, os.path.dirname(os.path.abspath(dst))), dst)
+
+
+# =========================
+# 이미 있는 파일을 새 위치에 연결
+# hardlink → reflink → symlink 순서로 시도
+# 임시 이름에 만든 뒤 os.replace 로 교체 (중간 상태의 dst 가 남지 않게)
+# =========================
+def link_existing(src: str, dst: str) -> str | None:
+    """
+    반환: 사용한 방식 ("hardlink" / "reflink" / "symlink"), 전부 실패면 None
+    dst 가 이미 있으면 건드리지 않고 None
+    """
+    if os.path.lexists(dst):
+        return None
+
+    tmp = dst + ".link" + PART_SUFFIX
+    for method, fn in (
+        ("hardlink", os.link),
+        ("reflink", _reflink),
+        ("symlink", _symlink),
+    ):
+        try:
+            # 이전에 중단되고 남은 임시 링크
+            if os.path.lexists(tmp):
+                os.remove(tmp)
+            fn(src, tmp)
+        except OSError:
+            continue
+
+        # 대상이 실제로 열리지 않는 링크면 사용하지 않음 (호출한 쪽이 새로 받도록)
+        if not os.path.exists(tmp):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return None
+
+        try:
+            os.replace(tmp, dst)
+            return method
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return None
+    return None
@@ -0,0 +1,141 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    HEADERS,
+    LOGIN,
+    API_KEY,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_MAX_RETRIES,
+    ARTIST_WORKERS,
+    FILE_WORKERS,
+    SEGMENT_COUNT,
+)
+from core.metrics import get_metrics
+from core.rate_limiter import RateLimiter, get_limiter
+
+REFERER = "https://danbooru.donmai.us/"
+
+# 속도를 줄이고 재시도할 응답 코드
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+# =========================
+# 공유 세션 (프로세스 전체에서 1개)
+# =========================
+def get_session() -> requests.Session:
+    """
+    모든 Danbooru 요청이 같이 쓰는 세션
+
+    - 호스트별 keep-alive 연결 풀 (TCP/TLS 핸드셰이크 재사용)
+    - 기본 헤더는 config.HEADERS
+    - 연결 풀 자체는 thread-safe 이므로 워커들이 그대로 공유
+    """
+    global _session
+
+    if _session is not None:
+        return _session
+
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            s.headers.update(HEADERS)
+
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                # CDN 최대 동시 연결 (작가 × 파일 × 구간) 보다 작으면 남는 연결은 버려져 keep-alive 를 잃음
+                pool_maxsize=max(HTTP_POOL_MAXSIZE, ARTIST_WORKERS * FILE_WORKERS * max(1, SEGMENT_COUNT)),
+            )
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+
+            _session = s
+
+    return _session
+
+
+def _retry_after(r: requests.Response) -> float | None:
+    value = r.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return (when - datetime.now(timezone.utc)).total_seconds()
+    except Exception:
+        return None
+
+
+# =========================
+# limiter 를 거치는 GET
+# (429/5xx 는 속도를 줄이고 HTTP_MAX_RETRIES 번까지 재시도)
+# 지표: 요청 수(응답 코드별) / 응답 시간 / 재시도 / 예외 / limiter 대기 시간
+# =========================
+def _get(kind: str, url: str, **kwargs) -> requests.Response:
+    limiter = get_limiter()
+    metrics = get_metrics()
+
+    attempt = 0
+    while True:
+        metrics.inc("rate_limit_wait_seconds_total", limiter.acquire(kind), kind=kind)
+
+        started = time.monotonic()
+        try:
+            r = get_session().get(url, **kwargs)
+        except Exception:
+            metrics.inc("http_errors_total", kind=kind)
+            raise
+        # stream=True 면 헤더까지 받은 시간
+        metrics.observe("http_response_seconds", time.monotonic() - started, kind=kind)
+        metrics.inc("http_requests_total", kind=kind, code=str(r.status_code))
+
+        if r.status_code not in RETRY_STATUS:
+            limiter.reward(kind)
+            return r
+
+        limiter.penalize(kind, _retry_after(r))
+        if attempt >= HTTP_MAX_RETRIES:
+            return r
+
+        r.close()
+        metrics.inc("http_retries_total", kind=kind)
+        attempt += 1
+
+
+# =========================
+# API 요청 (posts.json / tags.json ...)
+# =========================
+def api_get(url: str, params: dict | None = None, timeout=(5, 15)) -> requests.Response:
+    params = dict(params or {})
+    if LOGIN and API_KEY:
+        params["login"] = LOGIN
+        params["api_key"] = API_KEY
+
+    return _get(RateLimiter.API, url, params=params, timeout=timeout)
+
+
+# =========================
+# 파일 요청 (CDN 원본)
+# =========================
+def file_get(url: str, timeout, headers: dict | None = None) -> requests.Response:
+    """
+    stream=True 로 연다.
+    응답은 with 블록으로 닫아야 연결이 풀로 돌아간다.
+    """
+    h = {"Referer": REFERER}
+    if headers:
+        h.update(headers)
+
+    return _get(RateLimiter.FILE, url, headers=h, stream=True, timeout=timeout)
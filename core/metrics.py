@@ -0,0 +1,203 @@
+import json
+import os
+import threading
+import time
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Prometheus 이름 접두어
+PREFIX = "dl_"
+
+
+# =========================
+# 히스토그램 (구간별 누적 개수 + 합계)
+# =========================
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 = +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """구간 상한 기준 근사값 (+Inf 구간이면 마지막 상한)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.buckets[min(i, len(self.buckets) - 1)]
+        return self.buckets[-1]
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def _num(v) -> str:
+    """정수는 그대로 (바이트 수 등 자릿수 손실 없이), 실수는 소수 6자리"""
+    if float(v).is_integer():
+        return str(int(v))
+    return f"{v:.6f}".rstrip("0")
+
+
+def _label_text(labels: tuple, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+# =========================
+# 실행 지표 (카운터 + 지연 히스토그램), 프로세스 전체에서 1개
+# =========================
+class Metrics:
+    """
+    counter:   inc("http_requests_total", kind="api", code="200")
+    histogram: observe("http_response_seconds", 0.12, kind="api")
+
+    이름 규칙은 Prometheus 그대로 (_total / _seconds / _bytes)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._hists = {}
+            self.started = time.time()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        k = _key(name, labels)
+        with self._lock:
+            self._counters[k] = self._counters.get(k, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        k = _key(name, labels)
+        with self._lock:
+            h = self._hists.get(k)
+            if h is None:
+                h = self._hists[k] = Histogram()
+            h.observe(value)
+
+    def counter(self, name: str, **match) -> float:
+        """이름이 같고 match 라벨이 맞는 카운터 합"""
+        with self._lock:
+            return sum(
+                v for (n, labels), v in self._counters.items()
+                if n == name and all(dict(labels).get(k) == str(m) for k, m in match.items())
+            )
+
+    def histogram(self, name: str, **labels) -> Histogram | None:
+        with self._lock:
+            return self._hists.get(_key(name, labels))
+
+    # -------------------------
+    # 내보내기
+    # -------------------------
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started": self.started,
+                "uptime": time.time() - self.started,
+                "counters": [
+                    {"name": n, "labels": dict(labels), "value": v}
+                    for (n, labels), v in sorted(self._counters.items())
+                ],
+                "histograms": [
+                    {
+                        "name": n,
+                        "labels": dict(labels),
+                        "count": h.count,
+                        "sum": h.sum,
+                        "buckets": dict(zip([str(b) for b in h.buckets] + ["+Inf"], h.counts)),
+                    }
+                    for (n, labels), h in sorted(self._hists.items())
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            typed = set()
+            for (n, labels), v in sorted(self._counters.items()):
+                if n not in typed:
+                    lines.append(f"# TYPE {PREFIX}{n} counter")
+                    typed.add(n)
+                lines.append(f"{PREFIX}{n}{_label_text(labels)} {_num(v)}")
+
+            for (n, labels), h in sorted(self._hists.items()):
+                if n not in typed:
+                    lines.append(f"# TYPE {PREFIX}{n} histogram")
+                    typed.add(n)
+                acc = 0
+                for upper, c in zip(list(h.buckets) + ["+Inf"], h.counts):
+                    acc += c
+                    le = 'le="' + str(upper) + '"'
+                    lines.append(f"{PREFIX}{n}_bucket{_label_text(labels, le)} {acc}")
+                lines.append(f"{PREFIX}{n}_sum{_label_text(labels)} {_num(h.sum)}")
+                lines.append(f"{PREFIX}{n}_count{_label_text(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, path: str, fmt: str):
+        """fmt = "prom" / "json", 임시 파일에 쓰고 교체 (읽는 쪽이 반쪽 파일을 보지 않게)"""
+        text = self.to_prometheus() if fmt == "prom" else json.dumps(self.snapshot(), ensure_ascii=False, indent=1)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except Exception:
+            pass
+
+    def report(self) -> list[str]:
+        """실행 종료 요약 (사람이 읽는 용도)"""
+        elapsed = max(1e-6, time.time() - self.started)
+        files = self.counter("files_total", result="downloaded")
+        mb = self.counter("download_bytes_total") / (1024 * 1024)
+
+        lines = [
+            f"elapsed {elapsed:.1f}s · files {files:g} ({files / elapsed:.2f}/s) · {mb:.1f}MB ({mb / elapsed:.2f}MB/s)"
+            f" · linked {self.counter('files_total', result='linked'):g}"
+            f" · existing {self.counter('files_total', result='exist'):g}"
+            f" · failed {self.counter('files_total', result='failed'):g}",
+        ]
+
+        for kind in ("api", "file"):
+            h = self.histogram("http_response_seconds", kind=kind)
+            if h is None:
+                continue
+            lines.append(
+                f"{kind}: requests {h.count} · p50 ≤{h.quantile(0.5):g}s · p95 ≤{h.quantile(0.95):g}s"
+                f" · 429 {self.counter('http_requests_total', kind=kind, code='429'):g}"
+                f" · retries {self.counter('http_retries_total', kind=kind):g}"
+                f" · errors {self.counter('http_errors_total', kind=kind):g}"
+                f" · limiter wait {self.counter('rate_limit_wait_seconds_total', kind=kind):.1f}s"
+            )
+
+        disk = self.histogram("disk_write_seconds")
+        if disk is not None:
+            lines.append(f"disk: writes {disk.count} files · {disk.sum:.1f}s · p95 ≤{disk.quantile(0.95):g}s")
+
+        return lines
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    return _metrics
@@ -0,0 +1,241 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    TAG_URL,
+    COUNTS_URL,
+    COUNT_CACHE_TTL,
+    COUNT_PREFETCH_BATCH,
+    COUNT_PREFETCH_WORKERS,
+)
+from core.downloader import get_total_count_by_pages
+from core.http_client import api_get
+from utils.logger import log_write
+
+
+# =========================
+# 작품 수 캐시 (디스크 JSON + TTL)
+# =========================
+class CountCache:
+    """
+    {artist: [count, 저장 시각(epoch)]} 형태로 저장
+
+    - get(): TTL 이 지났거나 없으면 None
+    - put(): 메모리 갱신 후 바로 파일에 기록 (임시 파일 → 교체)
+    """
+
+    def __init__(self, path: str, ttl: float = COUNT_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._data = data
+        except Exception:
+            self._data = {}
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def get(self, artist: str) -> int | None:
+        with self._lock:
+            entry = self._data.get(artist)
+        if not entry:
+            return None
+
+        count, saved_at = entry
+        if time.time() - saved_at > self.ttl:
+            return None
+        return count
+
+    def put(self, artist: str, count: int):
+        self.put_many({artist: count})
+
+    def put_many(self, counts: dict[str, int]):
+        if not counts:
+            return
+        now = time.time()
+        with self._lock:
+            for artist, count in counts.items():
+                self._data[artist] = [count, now]
+            self._save()
+
+
+# =========================
+# 태그 post_count 조회 (요청 1번)
+# =========================
+def fetch_tag_post_count(artist: str) -> int | None:
+    # 공백이 있으면 태그 1개가 아니라 검색식 → 태그 조회 불가
+    if not artist or " " in artist.strip():
+        return None
+
+    try:
+        r = api_get(
+            TAG_URL,
+            params={
+                "search[name]": artist,
+                "only": "name,post_count",
+                "limit": 1,
+            },
+            timeout=(5, 15),
+        )
+        if r.status_code != 200:
+            return None
+        tags = r.json()
+    except Exception:
+        return None
+
+    for tag in tags if isinstance(tags, list) else []:
+        if tag.get("name") == artist:
+            return int(tag.get("post_count", 0))
+    return None
+
+
+# =========================
+# 태그 post_count 일괄 조회 (요청 1번에 여러 작가)
+# =========================
+def fetch_tag_post_counts(artists: list[str]) -> dict[str, int] | None:
+    """
+    search[name_comma] 로 한 번에 조회
+    응답에 없는 이름(태그 없음)은 결과에서 빠진다. 요청 실패면 None.
+    """
+    try:
+        r = api_get(
+            TAG_URL,
+            params={
+                "search[name_comma]": ",".join(artists),
+                "only": "name,post_count",
+                "limit": len(artists),
+            },
+            timeout=(5, 30),
+        )
+        if r.status_code != 200:
+            return None
+        tags = r.json()
+    except Exception:
+        return None
+
+    wanted = set(artists)
+    return {
+        tag["name"]: int(tag.get("post_count", 0))
+        for tag in (tags if isinstance(tags, list) else [])
+        if tag.get("name") in wanted
+    }
+
+
+def prefetch_post_counts(
+    artists: list[str],
+    cache: CountCache,
+    log_path: str = "",
+    stop_event=None,
+) -> dict[str, int]:
+    """
+    실행 시작 전에 캐시에 없는 작가들의 작품 수를 미리 채운다.
+
+    - COUNT_PREFETCH_BATCH 명씩 묶어 tags.json 요청
+    - 묶음들은 COUNT_PREFETCH_WORKERS 개 스레드로 동시에
+    - 태그 조회가 안 되는 이름(검색식, 콤마 포함)은 건너뜀 → 작가 시작 시 개별 조회
+
+    반환: {artist: count} (캐시에 있던 것 + 이번에 받은 것)
+    """
+    result = {}
+    missing = []
+
+    for artist in artists:
+        cached = cache.get(artist)
+        if cached is not None:
+            result[artist] = cached
+        elif artist and " " not in artist.strip() and "," not in artist:
+            missing.append(artist)
+
+    batches = [
+        missing[i:i + COUNT_PREFETCH_BATCH]
+        for i in range(0, len(missing), COUNT_PREFETCH_BATCH)
+    ]
+
+    def run(batch: list[str]) -> dict[str, int]:
+        if stop_event and stop_event.is_set():
+            return {}
+        counts = fetch_tag_post_counts(batch)
+        if counts is None:
+            if log_path:
+                log_write(log_path, "ERROR", f"[prefetch] tag count batch failed ({len(batch)} artists)")
+            return {}
+        return counts
+
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=max(1, COUNT_PREFETCH_WORKERS)) as pool:
+        for counts in pool.map(run, batches):
+            fetched.update(counts)
+
+    cache.put_many(fetched)
+    result.update(fetched)
+
+    if log_path and missing:
+        log_write(log_path, "INFO", f"[prefetch] counts {len(fetched)} / {len(missing)} artists fetched")
+
+    return result
+
+
+# =========================
+# posts 개수 조회 (요청 1번, 검색식도 가능)
+# =========================
+def fetch_posts_count(tags: str) -> int | None:
+    try:
+        r = api_get(COUNTS_URL, params={"tags": tags}, timeout=(5, 15))
+        if r.status_code != 200:
+            return None
+        return int(r.json()["counts"]["posts"])
+    except Exception:
+        return None
+
+
+# =========================
+# 작가 전체 작품 수
+# 캐시 → 태그 post_count → counts → (최후) 페이지 탐색
+# =========================
+def get_total_count(artist: str, log_path: str = "", cache: CountCache | None = None) -> int:
+    """
+    반환 규칙은 get_total_count_by_pages 와 같음
+      >0  : 전체 이미지 수
+      0   : 작품 없음
+      -1  : 계산 실패
+    """
+    if cache is not None:
+        cached = cache.get(artist)
+        if cached is not None:
+            return cached
+
+    count = fetch_tag_post_count(artist)
+
+    if count is None:
+        count = fetch_posts_count(artist)
+
+    if count is None:
+        if log_path:
+            log_write(log_path, "INFO", f"{artist} : count lookup failed → page probe")
+        count = get_total_count_by_pages(artist, log_path=log_path)
+
+    if count >= 0 and cache is not None:
+        cache.put(artist, count)
+
+    return count
@@ -0,0 +1,122 @@
+import threading
+import time
+
+from config import (
+    API_RATE,
+    API_BURST,
+    FILE_RATE,
+    FILE_BURST,
+    RATE_BACKOFF,
+    RATE_RECOVER,
+    RATE_MIN_FACTOR,
+)
+
+# Retry-After 가 없을 때 연속 실패 횟수에 따른 대기 상한 (초)
+MAX_COOLDOWN = 60.0
+
+
+# =========================
+# 적응형 token bucket
+# =========================
+class TokenBucket:
+    """
+    rate 개/초로 토큰이 차고, burst 개까지 쌓인다.
+
+    - penalize(): 429/5xx → 속도를 RATE_BACKOFF 배로, 쿨다운 동안 전부 대기
+    - reward():   성공     → 상한(max_rate)까지 조금씩 회복
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = float(rate)
+        self.min_rate = self.max_rate * RATE_MIN_FACTOR
+        self.rate = self.max_rate
+        self.burst = max(1, int(burst))
+
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self) -> float:
+        """토큰 1개를 얻을 때까지 대기. 반환: 실제로 잔 시간(초)"""
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, retry_after: float | None = None):
+        with self._lock:
+            self._failures += 1
+            self.rate = max(self.min_rate, self.rate * RATE_BACKOFF)
+
+            if retry_after is None:
+                cooldown = min(MAX_COOLDOWN, 2.0 ** self._failures)
+            else:
+                cooldown = max(0.0, retry_after)
+
+            self._blocked_until = max(self._blocked_until, time.monotonic() + cooldown)
+            self._tokens = 0.0
+
+    def reward(self):
+        with self._lock:
+            self._failures = 0
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_RECOVER)
+
+
+# =========================
+# 요청 종류별 limiter (프로세스 전체 공유)
+# =========================
+class RateLimiter:
+    API = "api"
+    FILE = "file"
+
+    def __init__(self):
+        self.buckets = {
+            self.API: TokenBucket(API_RATE, API_BURST),
+            self.FILE: TokenBucket(FILE_RATE, FILE_BURST),
+        }
+
+    def acquire(self, kind: str) -> float:
+        return self.buckets[kind].acquire()
+
+    def penalize(self, kind: str, retry_after: float | None = None):
+        self.buckets[kind].penalize(retry_after)
+
+    def reward(self, kind: str):
+        self.buckets[kind].reward()
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter() -> RateLimiter:
+    global _limiter
+
+    if _limiter is not None:
+        return _limiter
+
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+
+    return _limiter
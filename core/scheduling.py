@@ -0,0 +1,38 @@
+# =========================
+# 작가 처리 순서 정책
+# =========================
+SCHEDULE_POLICIES = ("file_order", "smallest_first", "largest_first")
+
+
+def estimate_missing(total: int | None, existing: int) -> int | None:
+    """남은 작업 추정치 (전체 작품 수를 모르면 None)"""
+    if total is None or total < 0:
+        return None
+    return max(0, total - existing)
+
+
+def order_pairs(pairs, policy: str, counts: dict, existing: dict) -> list:
+    """
+    pairs: [(artist, base_dir)]
+    counts: {artist: 전체 작품 수} (캐시/일괄 조회 값, API 호출 없음)
+    existing: {artist: 이미 가진 파일 수}
+
+    작품 수를 모르는 작가는 정책과 상관없이 맨 뒤 (목록 순서 유지)
+    """
+    pairs = list(pairs)
+    if policy not in ("smallest_first", "largest_first"):
+        return pairs
+
+    known = []
+    unknown = []
+    for pos, (artist, base_dir) in enumerate(pairs):
+        missing = estimate_missing(counts.get(artist), existing.get(artist, 0))
+        if missing is None:
+            unknown.append((artist, base_dir))
+        else:
+            known.append((missing, pos, (artist, base_dir)))
+
+    reverse = (policy == "largest_first")
+    known.sort(key=lambda x: (-x[0] if reverse else x[0], x[1]))
+
+    return [pair for _, _, pair in known] + unknown
@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+
+
+# =========================
+# 작가별 동기화 상태 (<목록>_sync.json)
+# =========================
+class SyncState:
+    """
+    {"watermarks": {artist: post_id}, "checkpoints": {artist: {...}}}
+
+    watermark = 마지막으로 끝까지 처리한 실행에서 본 가장 큰 post id
+    다음 실행은 이 id 보다 큰 글만 조회한다.
+
+    checkpoint = 중간에 멈춘 작가의 다음 페이지 위치 (페이지 경계마다 기록)
+    다음 실행은 1페이지 대신 여기서 이어서 조회한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data = {"watermarks": {}, "checkpoints": {}}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._data.update(data)
+        except Exception:
+            pass
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def get_watermark(self, artist: str) -> int:
+        with self._lock:
+            return int(self._data["watermarks"].get(artist, 0))
+
+    def set_watermark(self, artist: str, post_id: int):
+        with self._lock:
+            marks = self._data["watermarks"]
+            if post_id > marks.get(artist, 0):
+                marks[artist] = post_id
+                self._save()
+
+    def clear_watermark(self, artist: str):
+        with self._lock:
+            if self._data["watermarks"].pop(artist, None) is not None:
+                self._save()
+
+    def get_checkpoint(self, artist: str) -> dict | None:
+        with self._lock:
+            cp = self._data["checkpoints"].get(artist)
+            return dict(cp) if isinstance(cp, dict) else None
+
+    def set_checkpoint(self, artist: str, checkpoint: dict):
+        with self._lock:
+            self._data["checkpoints"][artist] = checkpoint
+            self._save()
+
+    def clear_checkpoint(self, artist: str):
+        with self._lock:
+            if self._data["checkpoints"].pop(artist, None) is not None:
+                self._save()
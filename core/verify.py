@@ -0,0 +1,104 @@
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import QUARANTINE_DIR
+from core.dir_snapshot import PART_SUFFIX
+
+MD5_NAME = re.compile(r"^[0-9a-f]{32}$")
+
+HASH_CHUNK = 1024 * 1024
+
+
+def hash_file(path: str):
+    """파일 전체의 md5 해시 객체 (이어서 update 가능)"""
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h
+
+
+def md5_file(path: str) -> str:
+    return hash_file(path).hexdigest()
+
+
+# =========================
+# 손상 파일 격리
+# <base_dir>/_quarantine/<작가 폴더>/<파일명>
+# =========================
+def quarantine(path: str) -> str | None:
+    """
+    path = <base_dir>/<작가 폴더>/<파일> 기준으로 base_dir 아래 격리 폴더로 이동
+    반환: 옮긴 경로 (실패 시 None)
+    """
+    artist_dir = os.path.dirname(path)
+    base_dir = os.path.dirname(artist_dir)
+    dest_dir = os.path.join(base_dir, QUARANTINE_DIR, os.path.basename(artist_dir))
+
+    name = os.path.basename(path)
+    if name.endswith(PART_SUFFIX):
+        name = name[:-len(PART_SUFFIX)]
+    dest = os.path.join(dest_dir, f"{time.time_ns()}_{name}")
+
+    try:
+        os.makedirs(dest_dir, exist_ok=True)
+        os.replace(path, dest)
+        return dest
+    except OSError:
+        return None
+
+
+# =========================
+# 라이브러리 검증
+# 파일명(md5.확장자) 과 실제 내용의 md5 비교
+# =========================
+def verify_library(base_dir: str, workers: int | None = None, stop_event=None, on_progress=None) -> tuple[int, list[str]]:
+    """
+    base_dir 아래 작가 폴더들의 파일을 여러 스레드로 해시 검증
+    (hashlib 은 큰 버퍼를 해시하는 동안 GIL 을 놓으므로 코어 수만큼 병렬)
+
+    - 파일명이 md5 형식이 아닌 파일(샘플 등)은 건너뜀
+    - 맞지 않는 파일은 quarantine() 으로 격리
+
+    반환: (검사한 파일 수, 격리한 원래 경로 목록)
+    """
+    targets = []
+    try:
+        artist_dirs = [e.path for e in os.scandir(base_dir) if e.is_dir() and not e.name.startswith("_")]
+    except OSError:
+        return 0, []
+
+    for d in artist_dirs:
+        try:
+            for f in os.scandir(d):
+                stem = os.path.splitext(f.name)[0].lower()
+                if f.is_file() and not f.is_symlink() and MD5_NAME.match(stem):
+                    targets.append((f.path, stem))
+        except OSError:
+            continue
+
+    def check(item) -> str | None:
+        path, expected = item
+        if stop_event and stop_event.is_set():
+            return None
+        try:
+            if md5_file(path) == expected:
+                return None
+        except OSError:
+            return None
+        return path if quarantine(path) else None
+
+    bad = []
+    checked = 0
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 4) as pool:
+        for result in pool.map(check, targets):
+            checked += 1
+            if result:
+                bad.append(result)
+            if on_progress:
+                on_progress(checked, len(targets), len(bad))
+
+    return checked, bad
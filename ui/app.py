@@ -4,12 +4,23 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import threading
 
+from config import ARTIST_WORKERS
+
 from ui.state import AppState
 from ui.ui_builder import build_ui
 from ui.ui_state_apply import apply_state
-
-from core.artist_list import parse_artist_file, read_completed
-from ui.download_controller import start_download_worker
+from ui.ui_artist_progress import (
+    reset_artist_slot,
+    start_artist_slot,
+    update_artist_progress,
+)
+
+from core.artist_list import parse_artist_file, read_completed, list_file_paths
+from ui.download_controller import (
+    start_download_worker,
+    start_rebuild_index_worker,
+    start_verify_library_worker,
+)
 
 STATE_FILE = "ui_last_state.json"
 
@@ -18,7 +29,7 @@ class DownloaderApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Danbooru Artist Downloader")
-        self.geometry("800x700")
+        self.geometry(f"800x{620 + 125 * max(1, ARTIST_WORKERS)}")
         self.resizable(False, False)
 
         # 상태
@@ -27,13 +38,12 @@ class DownloaderApp(tk.Tk):
         # 실행 제어
         self.stop_event = threading.Event()
         self.stop_after_current = False
+        self.engine = None
 
         # 데이터
         self.artist_file_path = None
         self.completed_path = ""
-        self.log_path = ""
         self.all_pairs = []
-        self.current_save_dir = None
 
         # UI
         build_ui(self)
@@ -99,11 +109,51 @@ class DownloaderApp(tk.Tk):
         if self.state != AppState.RUNNING:
             return
         self.stop_after_current = not self.stop_after_current
+        if self.engine is not None:
+            if self.stop_after_current:
+                self.engine.stop_after.set()
+            else:
+                self.engine.stop_after.clear()
         self.apply_state()
 
-    def open_current_path(self):
-        if self.current_save_dir and os.path.isdir(self.current_save_dir):
-            os.startfile(self.current_save_dir)
+    def open_slot_path(self, index: int):
+        save_dir = self.slots[index].save_dir
+        if save_dir and os.path.isdir(save_dir):
+            os.startfile(save_dir)
+
+    def on_rebuild_index(self):
+        if self.state not in (AppState.READY, AppState.FINISHED):
+            return
+        if not messagebox.askyesno("인덱스 재구성", "저장 폴더를 전부 훑어서 다운로드 인덱스를 다시 만듭니다.\n계속할까요?"):
+            return
+        self.set_state(AppState.LOADING)
+        start_rebuild_index_worker(self)
+
+    def on_rebuild_index_done(self, total: int | None):
+        self.set_state(AppState.READY)
+        if total is None:
+            messagebox.showerror("인덱스 재구성", "인덱스 재구성 중 오류가 발생했습니다.")
+            return
+        messagebox.showinfo("인덱스 재구성", f"인덱스 재구성 완료: {total}개 파일")
+
+    def on_verify_library(self):
+        if self.state not in (AppState.READY, AppState.FINISHED):
+            return
+        if not messagebox.askyesno("라이브러리 검증", "저장된 파일을 전부 md5 로 검증합니다.\n손상된 파일은 _quarantine 폴더로 옮깁니다.\n계속할까요?"):
+            return
+        self.set_state(AppState.LOADING)
+        start_verify_library_worker(self)
+
+    def on_verify_library_done(self, result: tuple[int, int] | None):
+        # 손상 파일이 있던 작가는 완료 목록에서 빠졌으므로 다시 읽어서 표시
+        completed = read_completed(self.completed_path)
+        self.update_total_progress(len(completed), 0, 0)
+        self.set_state(AppState.READY)
+        if result is None:
+            messagebox.showerror("라이브러리 검증", "검증 중 오류가 발생했습니다.")
+            return
+        checked, bad = result
+        messagebox.showinfo("라이브러리 검증", f"검증 완료: {checked}개 중 손상 {bad}개")
 
     def open_artist_file(self):
         if self.artist_file_path and os.path.isfile(self.artist_file_path):
@@ -118,9 +168,7 @@ class DownloaderApp(tk.Tk):
             self.set_state(AppState.IDLE)
             return
 
-        base, _ = os.path.splitext(path)
-        self.completed_path = base + "_completed.txt"
-        self.log_path = base + "_log.txt"
+        self.completed_path = list_file_paths(path)["completed"]
 
         self.all_pairs = parse_artist_file(path)
         completed = read_completed(self.completed_path)
@@ -135,48 +183,38 @@ class DownloaderApp(tk.Tk):
         self.bar_total["value"] = len(completed)
         self.lbl_total.config(text=f"{len(completed)} / {len(self.all_pairs)}")
 
-        # 현재 작가 진행 초기화
-        self._reset_current_artist_ui()
+        # 작가별 진행 초기화
+        self.reset_all_slots()
 
         self.set_state(AppState.READY)
 
-    def _reset_current_artist_ui(self):
-        self.lbl_artist.config(text="작가: -")
-        self.lbl_path.config(text="저장 경로: -")
-        self.lbl_prog.config(text="다운로드: 0 / 기존: 0 (체크:0) / 전체: -")
-        self.lbl_artist_progress.config(text="- / - (0.0%)")
-        try:
-            self.bar_artist.config(maximum=1, value=0)
-        except Exception:
-            pass
-        self.current_save_dir = None
+    # ==================================================
+    # 작가별 슬롯 UI (download_controller 의 주기적 폴링에서 호출)
+    # ==================================================
+    def reset_all_slots(self):
+        for slot in self.slots:
+            reset_artist_slot(slot)
+
+    def start_slot(self, index: int, artist: str, save_dir: str, initial_exist: int, total: int):
+        start_artist_slot(self.slots[index], artist, save_dir, initial_exist, total)
+
+    def update_slot_progress(self, index: int, downloaded: int, initial_exist: int, found_exist: int, total: int):
+        update_artist_progress(self.slots[index], downloaded, initial_exist, found_exist, total)
 
     # ==================================================
-    # 현재 작가 UI 업데이트 (다운로더 콜백에서 호출)
+    # 전체 진행 (작품 수를 알면 작품 기준, 모르면 작가 기준)
     # ==================================================
-    def update_current_artist_progress(self, downloaded: int, initial_exist: int, found_exist: int, total: int):
-        # total이 0 이하일 땐 대략치를 못 구한 경우
-        if total and total > 0:
-            owned = initial_exist + downloaded
-            if owned > total:
-                owned = total
-            percent = owned / total * 100.0
-            try:
-                self.bar_artist["value"] = owned
-            except Exception:
-                pass
-            self.lbl_artist_progress.config(text=f"{owned} / {total} ({percent:.1f}%)")
-        else:
-            # total을 모르면 숫자만 유지
-            self.lbl_artist_progress.config(text="- / - (0.0%)")
-
-        self.lbl_prog.config(
-            text=(
-                f"다운로드: {downloaded} / "
-                f"기존: {initial_exist} (체크:{found_exist}) / "
-                f"전체: {total if total and total > 0 else '-'}"
+    def update_total_progress(self, done_artists: int, done_posts: int, total_posts: int):
+        n = len(self.all_pairs)
+        if total_posts > 0:
+            owned = min(done_posts, total_posts)
+            self.bar_total.config(maximum=total_posts, value=owned)
+            self.lbl_total.config(
+                text=f"작가 {done_artists} / {n} · 작품 {owned} / {total_posts} ({owned / total_posts * 100:.1f}%)"
             )
-        )
+        else:
+            self.bar_total.config(maximum=max(1, n), value=done_artists)
+            self.lbl_total.config(text=f"{done_artists} / {n}")
 
     # ==================================================
     # last_state (IDLE에서 UI만 표시)
@@ -1,19 +1,70 @@
-import os
 import threading
 
-from core.artist_list import read_completed, append_completed
-from core.downloader import download_artist, get_total_count_by_pages, sanitize_folder_name
+from config import UI_POLL_MS
+from core.engine import (
+    DownloadEngine,
+    rebuild_index,
+    verify_all,
+    EVENT_COUNTING,
+    EVENT_TOTAL,
+    EVENT_SLOT_START,
+    EVENT_SLOT_PROGRESS,
+    EVENT_FINISHED,
+)
 from ui.state import AppState
 
 
-def _count_existing_files(save_dir: str) -> int:
-    try:
-        return sum(
-            1 for f in os.listdir(save_dir)
-            if os.path.isfile(os.path.join(save_dir, f))
-        )
-    except Exception:
-        return 0
+class ProgressBoard:
+    """
+    엔진 이벤트(워커 스레드) → 최신 값만 보관
+    UI 는 UI_POLL_MS 마다 take() 로 바뀐 것만 가져가서 한 번에 반영한다.
+    (이벤트가 아무리 많아도 UI 스레드 비용은 주기당 1회로 고정)
+    """
+
+    def __init__(self, n_slots: int):
+        self._lock = threading.Lock()
+        self._counting = False
+        self._total = None
+        self._starts = [None] * n_slots
+        self._progress = [None] * n_slots
+        self._finished = False
+
+    def on_event(self, kind, data):
+        with self._lock:
+            if kind == EVENT_COUNTING:
+                self._counting = True
+
+            elif kind == EVENT_TOTAL:
+                self._counting = False
+                self._total = (data["done"], data["posts_done"], data["posts_total"])
+
+            elif kind == EVENT_SLOT_START:
+                slot = data["slot"]
+                self._starts[slot] = (data["artist"], data["save_dir"], data["initial_exist"], data["total"])
+                self._progress[slot] = None  # 이전 작가의 진행 값은 버림
+
+            elif kind == EVENT_SLOT_PROGRESS:
+                self._progress[data["slot"]] = (
+                    data["downloaded"], data["initial_exist"], data["found_exist"], data["total"])
+
+            elif kind == EVENT_FINISHED:
+                self._finished = True
+
+    def take(self) -> dict:
+        """지난 take() 이후 바뀐 값 (항상 dict, 바뀌지 않은 항목은 None / False)"""
+        with self._lock:
+            changes = {
+                "counting": self._counting,
+                "total": self._total,
+                "starts": self._starts,
+                "progress": self._progress,
+                "finished": self._finished,
+            }
+            self._counting = False
+            self._total = None
+            self._starts = [None] * len(self._starts)
+            self._progress = [None] * len(self._progress)
+        return changes
 
 
 def start_download_worker(app):
@@ -21,78 +72,71 @@ def start_download_worker(app):
     app.stop_event.clear()
     app.stop_after_current = False
 
-    overwrite = (app.overwrite_var.get() == "overwrite")
+    board = ProgressBoard(len(app.slots))
+
+    # UI 스레드: 주기적으로 최신 값만 반영
+    def poll():
+        changes = board.take()
+
+        if changes["counting"]:
+            app.lbl_total.config(text="작품 수 조회 중...")
+
+        for slot, start in enumerate(changes["starts"]):
+            if start is not None:
+                app.start_slot(slot, *start)
+
+        for slot, progress in enumerate(changes["progress"]):
+            if progress is not None:
+                app.update_slot_progress(slot, *progress)
+
+        if changes["total"] is not None:
+            app.update_total_progress(*changes["total"])
+
+        if changes["finished"]:
+            # 종료 상태 처리
+            app.stop_after_current = False
+            app.set_state(AppState.FINISHED)
+            return
+
+        app.after(UI_POLL_MS, poll)
+
+    app.engine = DownloadEngine(
+        app.artist_file_path,
+        pairs=app.all_pairs,
+        overwrite=(app.overwrite_var.get() == "overwrite"),
+        variant=app.variant_var.get(),
+        policy=app.schedule_var.get(),
+        slots=len(app.slots),
+        on_event=board.on_event,
+        stop_event=app.stop_event,
+    )
+    app.engine.start()
+    app.after(UI_POLL_MS, poll)
+
+
+def start_rebuild_index_worker(app):
+    """LOADING 상태에서 인덱스 재구성, 실패해도 끝나면 항상 READY 로 복귀"""
+    def worker():
+        total = None  # 예외로 끝나면 None
+        try:
+            total = rebuild_index(app.artist_file_path, app.all_pairs)
+        finally:
+            app.after(0, lambda: app.on_rebuild_index_done(total))
+
+    threading.Thread(target=worker, daemon=True).start()
+
+
+def start_verify_library_worker(app):
+    """LOADING 상태에서 라이브러리 검증, 실패해도 끝나면 항상 READY 로 복귀"""
+    def on_progress(checked, total, bad):
+        if checked % 200 == 0 or checked == total:
+            app.after(0, lambda: app.lbl_total.config(text=f"검증 중 {checked} / {total} (손상 {bad})"))
 
     def worker():
-        completed = set(read_completed(app.completed_path))
-        done = len(completed)
-
-        for artist, base_dir in app.all_pairs:
-            # STOPPING 요청이면 루프 종료 (정책: 현재 이미지/페이지는 downloader가 처리)
-            if app.stop_event.is_set():
-                break
-
-            if artist in completed:
-                continue
-
-            safe_name = sanitize_folder_name(artist)
-            save_dir = os.path.join(base_dir, safe_name)
-            os.makedirs(save_dir, exist_ok=True)
-            app.current_save_dir = save_dir
-
-            initial_exist = _count_existing_files(save_dir)
-            total_count = get_total_count_by_pages(artist, log_path=app.log_path)
-
-            # UI 초기 표시(현재 작가)
-            app.after(0, lambda a=artist: app.lbl_artist.config(text=f"작가: {a}"))
-            app.after(0, lambda p=save_dir: app.lbl_path.config(text=f"저장 경로: {p}"))
-
-            # 현재 작가 progress 초기 세팅
-            if total_count and total_count > 0:
-                app.after(0, lambda mt=total_count, v=min(initial_exist, total_count):
-                          app.bar_artist.config(maximum=mt, value=v))
-                owned = min(initial_exist, total_count)
-                percent = owned / total_count * 100.0
-                app.after(0, lambda o=owned, t=total_count, pc=percent:
-                          app.lbl_artist_progress.config(text=f"{o} / {t} ({pc:.1f}%)"))
-            else:
-                app.after(0, lambda: app.bar_artist.config(maximum=1, value=0))
-                app.after(0, lambda: app.lbl_artist_progress.config(text="- / - (0.0%)"))
-
-            # 현재 작가 카운트 표시 초기화
-            app.after(0, lambda ie=initial_exist, tc=total_count:
-                      app.lbl_prog.config(text=f"다운로드: 0 / 기존: {ie} (체크:0) / 전체: {tc if tc and tc>0 else '-'}"))
-
-            # 다운로드 실행 (다운로더가 ui_cb로 계속 갱신)
-            ok, downloaded = download_artist(
-                artist=artist,
-                base_dir=base_dir,
-                log_path=app.log_path,
-                total_count=total_count,
-                initial_exist_count=initial_exist,
-                ui_cb=lambda d, init_e, found_e, t:
-                    app.after(0, lambda dd=d, ie=init_e, fe=found_e, tt=t:
-                              app.update_current_artist_progress(dd, ie, fe, tt)),
-                stop_event=app.stop_event,
-                overwrite=overwrite
-            )
-
-            # 완료 기록
-            if ok:
-                append_completed(app.completed_path, artist)
-                completed.add(artist)
-
-            done += 1
-            app.after(0, lambda: app.bar_total.step(1))
-            app.after(0, lambda d=done: app.lbl_total.config(text=f"{d} / {len(app.all_pairs)}"))
-
-            # “이번 작가까지”
-            if app.stop_after_current:
-                # 다음 루프 진행 막고 종료
-                break
-
-        # 종료 상태 처리
-        app.stop_after_current = False
-        app.after(0, lambda: app.set_state(AppState.FINISHED))
+        result = None  # 예외로 끝나면 None
+        try:
+            result = verify_all(app.artist_file_path, app.all_pairs, on_progress=on_progress)
+        finally:
+            app.after(0, lambda: app.on_verify_library_done(result))
 
     threading.Thread(target=worker, daemon=True).start()
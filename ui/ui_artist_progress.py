@@ -1,19 +1,124 @@
-def update_artist_progress(app, downloaded, initial_exist, found_exist, total):
-    if total <= 0:
-        return
+import tkinter as tk
+from tkinter import ttk
 
-    owned = min(initial_exist + downloaded, total)
-    percent = owned / total * 100
 
-    app.bar_artist["value"] = owned
-    app.lbl_artist_progress.config(
-        text=f"{owned} / {total} ({percent:.1f}%)"
-    )
+class ArtistSlot:
+    """
+    작가 1명 진행 표시 영역 (슬롯)
+
+    동시에 진행하는 작가 수만큼 만들어지고,
+    다운로드 워커가 작가를 하나 맡을 때마다 재사용된다.
+    """
+
+    def __init__(self, parent, index: int, on_open_path):
+        self.index = index
+        self.save_dir = None
+
+        frame = tk.Frame(parent)
+        frame.pack(fill="x", pady=(10 if index else 6, 0))
+
+        # 작가 라인 + 열기 버튼
+        artist_row = tk.Frame(frame)
+        artist_row.pack(fill="x")
+
+        self.lbl_artist = tk.Label(
+            artist_row,
+            text=f"[{index + 1}] 작가: -",
+            anchor="w"
+        )
+        self.lbl_artist.pack(side="left", fill="x", expand=True)
+
+        self.btn_open_path = tk.Button(
+            artist_row,
+            text="📂 열기",
+            width=6,
+            command=lambda: on_open_path(index)
+        )
+        self.btn_open_path.pack(side="right")
+
+        # 저장 경로
+        self.lbl_path = tk.Label(
+            frame,
+            text="저장 경로: -",
+            anchor="w",
+            fg="#1565C0"
+        )
+        self.lbl_path.pack(fill="x")
+
+        # 다운로드/기존/전체 표시
+        self.lbl_prog = tk.Label(
+            frame,
+            text="다운로드: 0 / 기존: 0 (체크:0) / 전체: -",
+            anchor="w"
+        )
+        self.lbl_prog.pack(fill="x", pady=(4, 0))
+
+        # 진행률 텍스트 + 바
+        prog_row = tk.Frame(frame)
+        prog_row.pack(fill="x", pady=(4, 0))
+
+        self.lbl_artist_progress = tk.Label(
+            prog_row,
+            text="- / - (0.0%)",
+            anchor="w",
+            width=24
+        )
+        self.lbl_artist_progress.pack(side="left")
+
+        self.bar_artist = ttk.Progressbar(
+            prog_row,
+            orient="horizontal",
+            mode="determinate"
+        )
+        self.bar_artist.pack(side="left", fill="x", expand=True)
+
+
+def reset_artist_slot(slot: ArtistSlot):
+    slot.lbl_artist.config(text=f"[{slot.index + 1}] 작가: -")
+    slot.lbl_path.config(text="저장 경로: -")
+    slot.lbl_prog.config(text="다운로드: 0 / 기존: 0 (체크:0) / 전체: -")
+    slot.lbl_artist_progress.config(text="- / - (0.0%)")
+    try:
+        slot.bar_artist.config(maximum=1, value=0)
+    except Exception:
+        pass
+    slot.save_dir = None
+
+
+def start_artist_slot(slot: ArtistSlot, artist, save_dir, initial_exist, total):
+    slot.save_dir = save_dir
+    slot.lbl_artist.config(text=f"[{slot.index + 1}] 작가: {artist}")
+    slot.lbl_path.config(text=f"저장 경로: {save_dir}")
+
+    if total and total > 0:
+        slot.bar_artist.config(maximum=total, value=min(initial_exist, total))
+    else:
+        slot.bar_artist.config(maximum=1, value=0)
+
+    update_artist_progress(slot, 0, initial_exist, 0, total)
+
+
+def update_artist_progress(slot: ArtistSlot, downloaded, initial_exist, found_exist, total):
+    # total이 0 이하일 땐 대략치를 못 구한 경우
+    if total and total > 0:
+        owned = min(initial_exist + downloaded, total)
+        percent = owned / total * 100
+
+        try:
+            slot.bar_artist["value"] = owned
+        except Exception:
+            pass
+        slot.lbl_artist_progress.config(
+            text=f"{owned} / {total} ({percent:.1f}%)"
+        )
+    else:
+        # total을 모르면 숫자만 유지
+        slot.lbl_artist_progress.config(text="- / - (0.0%)")
 
-    app.lbl_prog.config(
+    slot.lbl_prog.config(
         text=(
             f"다운로드: {downloaded} / "
-            f"기존: {initial_exist} (채크:{found_exist}) / "
-            f"전체: {total}"
+            f"기존: {initial_exist} (체크:{found_exist}) / "
+            f"전체: {total if total and total > 0 else '-'}"
         )
     )
@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
 
+from config import ARTIST_WORKERS, DOWNLOAD_VARIANT, VARIANT_MAX_MB, SCHEDULE_POLICY
+from ui.ui_artist_progress import ArtistSlot
+
 
 def build_ui(app):
     root = tk.Frame(app, padx=18, pady=18)
@@ -76,6 +79,69 @@ def build_ui(app):
     )
     app.radio_overwrite.pack(anchor="w")
 
+    # 받을 파일 종류 (원본 / 샘플 ...)
+    variant_row = tk.Frame(opt)
+    variant_row.pack(anchor="w", pady=(4, 0))
+
+    tk.Label(variant_row, text="받을 파일:").pack(side="left")
+
+    app.variant_var = tk.StringVar(value=DOWNLOAD_VARIANT)
+    app.radio_variants = []
+    for value, text in (
+        ("original", "원본"),
+        ("large", "large"),
+        ("sample", "sample"),
+        ("best_under", f"{VARIANT_MAX_MB}MB 이하만 원본"),
+    ):
+        rb = tk.Radiobutton(
+            variant_row,
+            text=text,
+            variable=app.variant_var,
+            value=value
+        )
+        rb.pack(side="left")
+        app.radio_variants.append(rb)
+
+    # 작가 처리 순서
+    schedule_row = tk.Frame(opt)
+    schedule_row.pack(anchor="w", pady=(4, 0))
+
+    tk.Label(schedule_row, text="처리 순서:").pack(side="left")
+
+    app.schedule_var = tk.StringVar(value=SCHEDULE_POLICY)
+    app.radio_schedules = []
+    for value, text in (
+        ("file_order", "목록 순서"),
+        ("smallest_first", "남은 작업 적은 순"),
+        ("largest_first", "남은 작업 많은 순"),
+    ):
+        rb = tk.Radiobutton(
+            schedule_row,
+            text=text,
+            variable=app.schedule_var,
+            value=value
+        )
+        rb.pack(side="left")
+        app.radio_schedules.append(rb)
+
+    # 도구 (옵션 영역 오른쪽 위)
+    tools = tk.Frame(opt)
+    tools.place(relx=1.0, rely=0.0, anchor="ne")
+
+    app.btn_verify_library = tk.Button(
+        tools,
+        text="🔍 라이브러리 검증",
+        command=app.on_verify_library
+    )
+    app.btn_verify_library.pack(side="right")
+
+    app.btn_rebuild_index = tk.Button(
+        tools,
+        text="🗂 인덱스 재구성",
+        command=app.on_rebuild_index
+    )
+    app.btn_rebuild_index.pack(side="right", padx=(0, 6))
+
     # ==================================================
     # 전체 진행 (전체 상태/전체 작가 진행)
     # ==================================================
@@ -108,68 +174,31 @@ def build_ui(app):
     app.bar_total.pack(fill="x", pady=(8, 0))
 
     # ==================================================
-    # 현재 작가 진행 (🔥 빠진 UI 복구 핵심)
+    # 작가별 진행 (동시에 도는 작가 수만큼 슬롯)
     # ==================================================
-    curr = tk.LabelFrame(root, text="현재 작가 진행", padx=12, pady=10)
+    curr = tk.LabelFrame(root, text="작가별 진행", padx=12, pady=10)
     curr.pack(fill="x", pady=(12, 0))
 
-    # 작가 라인 + 이번 작가까지 버튼
-    artist_row = tk.Frame(curr)
-    artist_row.pack(fill="x")
+    # 이번 작가까지 버튼 (모든 슬롯에 적용)
+    ctrl_row = tk.Frame(curr)
+    ctrl_row.pack(fill="x")
 
-    app.lbl_artist = tk.Label(
-        artist_row,
-        text="작가: -",
-        anchor="w"
+    app.lbl_active = tk.Label(
+        ctrl_row,
+        text=f"동시 진행: {ARTIST_WORKERS}명",
+        anchor="w",
+        fg="#455A64"
     )
-    app.lbl_artist.pack(side="left", fill="x", expand=True)
+    app.lbl_active.pack(side="left", fill="x", expand=True)
 
     app.btn_stop_after = tk.Button(
-        artist_row,
+        ctrl_row,
         text="⏭ 이번 작가까지 받기",
         command=app.toggle_stop_after
     )
     app.btn_stop_after.pack(side="right")
 
-    # 저장 경로 라인 + 열기 버튼
-    path_row = tk.Frame(curr)
-    path_row.pack(fill="x", pady=(4, 0))
-
-    app.lbl_path = tk.Label(
-        path_row,
-        text="저장 경로: -",
-        anchor="w",
-        fg="#1565C0"
-    )
-    app.lbl_path.pack(side="left", fill="x", expand=True)
-
-    app.btn_open_path = tk.Button(
-        path_row,
-        text="📂 열기",
-        width=6,
-        command=app.open_current_path
-    )
-    app.btn_open_path.pack(side="right")
-
-    # 다운로드/기존/전체 표시(현재 작가 전용)
-    app.lbl_prog = tk.Label(
-        curr,
-        text="다운로드: 0 / 기존: 0 (체크:0) / 전체: -",
-        anchor="w"
-    )
-    app.lbl_prog.pack(fill="x", pady=(8, 0))
-
-    # 현재 작가 진행률 텍스트 + 바
-    app.lbl_artist_progress = tk.Label(
-        curr,
-        text="- / - (0.0%)",
-        anchor="w"
-    )
-    app.lbl_artist_progress.pack(fill="x", pady=(6, 0))
-
-    app.bar_artist = ttk.Progressbar(
-        curr,
-        orient="horizontal",
-        mode="determinate"
-    )
-    app.bar_artist.pack(fill="x", pady=(8, 0))
+    app.slots = [
+        ArtistSlot(curr, i, app.open_slot_path)
+        for i in range(max(1, ARTIST_WORKERS))
+    ]
@@ -3,6 +3,7 @@ from ui.state import AppState
 
 def apply_state(app):
     s = app.state
+    open_paths = [slot.btn_open_path for slot in app.slots]
     app.lbl_mode.config(text=f"상태: {s.name}")
 
     def disable(*ws):
@@ -48,47 +49,54 @@ def apply_state(app):
         disable(
             app.btn_start_stop,
             app.btn_stop_after,
-            app.btn_open_path,
+            *open_paths,
             app.btn_open_artist_file,
             app.radio_skip,
-            app.radio_overwrite
+            app.radio_overwrite,
+            *app.radio_variants,
+            *app.radio_schedules,
+            app.btn_rebuild_index,
+            app.btn_verify_library
         )
         set_start_btn_idle()
         app.btn_stop_after.config(bg="#E0E0E0", fg="black")
-        app.btn_open_path.config(state="disabled")
 
     elif s == AppState.LOADING:
         disable(
             app.btn_select_txt,
             app.btn_start_stop,
             app.btn_stop_after,
-            app.btn_open_path,
+            *open_paths,
             app.btn_open_artist_file,
             app.radio_skip,
-            app.radio_overwrite
+            app.radio_overwrite,
+            *app.radio_variants,
+            *app.radio_schedules,
+            app.btn_rebuild_index,
+            app.btn_verify_library
         )
         set_start_btn_idle()
 
     elif s == AppState.READY:
-        enable(app.btn_select_txt, app.btn_start_stop, app.btn_open_artist_file, app.radio_skip, app.radio_overwrite)
-        disable(app.btn_stop_after, app.btn_open_path)
+        enable(app.btn_select_txt, app.btn_start_stop, app.btn_open_artist_file, app.radio_skip, app.radio_overwrite, *app.radio_variants, *app.radio_schedules, app.btn_rebuild_index, app.btn_verify_library)
+        disable(app.btn_stop_after, *open_paths)
         set_start_btn_start()
         app.stop_after_current = False
         apply_stop_after_color()
 
     elif s == AppState.RUNNING:
-        disable(app.btn_select_txt, app.btn_open_artist_file, app.radio_skip, app.radio_overwrite)
-        enable(app.btn_start_stop, app.btn_stop_after, app.btn_open_path)
+        disable(app.btn_select_txt, app.btn_open_artist_file, app.radio_skip, app.radio_overwrite, *app.radio_variants, *app.radio_schedules, app.btn_rebuild_index, app.btn_verify_library)
+        enable(app.btn_start_stop, app.btn_stop_after, *open_paths)
         set_start_btn_stop()
         apply_stop_after_color()
 
     elif s == AppState.STOPPING:
-        disable(app.btn_select_txt, app.btn_start_stop, app.btn_stop_after, app.btn_open_path, app.btn_open_artist_file, app.radio_skip, app.radio_overwrite)
+        disable(app.btn_select_txt, app.btn_start_stop, app.btn_stop_after, *open_paths, app.btn_open_artist_file, app.radio_skip, app.radio_overwrite, *app.radio_variants, *app.radio_schedules, app.btn_rebuild_index, app.btn_verify_library)
         set_start_btn_stopping()
 
     elif s == AppState.FINISHED:
-        enable(app.btn_select_txt, app.btn_start_stop, app.btn_open_artist_file, app.radio_skip, app.radio_overwrite)
-        disable(app.btn_stop_after, app.btn_open_path)
+        enable(app.btn_select_txt, app.btn_start_stop, app.btn_open_artist_file, app.radio_skip, app.radio_overwrite, *app.radio_variants, *app.radio_schedules, app.btn_rebuild_index, app.btn_verify_library)
+        disable(app.btn_stop_after, *open_paths)
         set_start_btn_start()
         app.stop_after_current = False
         apply_stop_after_color()
@@ -1,6 +1,146 @@
+import atexit
+import json
+import os
+import queue
+import threading
 from datetime import datetime
 
+from config import LOG_MAX_MB, LOG_BACKUPS, LOG_FORMAT, LOG_FLUSH_INTERVAL
+
+
+# =========================
+# 버퍼 로그 (큐 + 기록 스레드 1개)
+# =========================
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+# 한 번에 모아서 쓰는 최대 줄 수
+_BATCH_MAX = 1000
+
+
 def log_write(path: str, level: str, msg: str):
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(f"[{ts}] [{level}] {msg}\n")
+    """기록 요청만 큐에 넣고 바로 반환 (실제 쓰기는 기록 스레드)"""
+    if not path:
+        return
+    _ensure_writer()
+    _queue.put((path, datetime.now(), level, msg))
+
+
+def flush_logs(timeout: float | None = None):
+    """지금까지 넣은 로그가 파일에 쓰일 때까지 대기"""
+    if _writer is None:
+        return
+    done = threading.Event()
+    _queue.put(done)
+    done.wait(timeout)
+
+
+def _ensure_writer():
+    global _writer
+    if _writer is not None:
+        return
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_run_writer, daemon=True, name="log-writer")
+            _writer.start()
+
+
+def _format(ts: datetime, level: str, msg: str) -> str:
+    if LOG_FORMAT == "jsonl":
+        return json.dumps(
+            {"ts": ts.isoformat(timespec="milliseconds"), "level": level, "msg": msg},
+            ensure_ascii=False,
+        ) + "\n"
+    return f"[{ts.strftime('%Y-%m-%d %H:%M:%S')}] [{level}] {msg}\n"
+
+
+def _target_path(path: str) -> str:
+    if LOG_FORMAT == "jsonl":
+        return os.path.splitext(path)[0] + ".jsonl"
+    return path
+
+
+def _rotate(path: str):
+    """path → path.1 → path.2 ... (LOG_BACKUPS 개까지)"""
+    if LOG_BACKUPS <= 0:
+        os.remove(path)
+        return
+    for i in range(LOG_BACKUPS - 1, 0, -1):
+        src = f"{path}.{i}"
+        if os.path.exists(src):
+            os.replace(src, f"{path}.{i + 1}")
+    os.replace(path, path + ".1")
+
+
+class _Sink:
+    """파일 1개: 열어 둔 채로 쓰고, 크기가 넘으면 회전"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.f = None
+        self.size = 0
+
+    def write(self, text: str):
+        if self.f is None:
+            self.f = open(self.path, "a", encoding="utf-8")
+            self.size = self.f.tell()
+
+        self.f.write(text)
+        self.size += len(text.encode("utf-8"))
+
+        if LOG_MAX_MB > 0 and self.size >= LOG_MAX_MB * 1024 * 1024:
+            self.close()
+            _rotate(self.path)
+
+    def flush(self):
+        if self.f is not None:
+            self.f.flush()
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+
+
+def _run_writer():
+    sinks = {}
+
+    while True:
+        # 첫 줄은 기다리고, 이후는 LOG_FLUSH_INTERVAL 동안 모아서 한 번에
+        # (flush 요청이 오면 바로 씀)
+        batch = [_queue.get()]
+        try:
+            while len(batch) < _BATCH_MAX and not isinstance(batch[-1], threading.Event):
+                batch.append(_queue.get(timeout=LOG_FLUSH_INTERVAL if len(batch) == 1 else 0.01))
+        except queue.Empty:
+            pass
+
+        waiters = []
+        for item in batch:
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                continue
+
+            path, ts, level, msg = item
+            target = _target_path(path)
+            sink = sinks.get(target)
+            if sink is None:
+                sink = sinks[target] = _Sink(target)
+            try:
+                sink.write(_format(ts, level, msg))
+            except Exception:
+                # 로그 실패로 다운로드를 멈추지 않음
+                sink.close()
+
+        for sink in sinks.values():
+            try:
+                sink.flush()
+            except Exception:
+                sink.close()
+
+        for done in waiters:
+            done.set()
+
+
+atexit.register(flush_logs, 5.0)